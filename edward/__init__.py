@@ -6,13 +6,17 @@ from edward import models
 from edward import stats
 from edward import criticisms
 from edward import inferences
+from edward import monitoring
+from edward import serving
 from edward import util
 
 # Direct imports for convenience
-from edward.models import PyMC3Model, PythonModel, StanModel
-from edward.criticisms import evaluate, ppc
+from edward.models import PosteriorSamples, PyMC3Model, PythonModel, \
+    StanModel
+from edward.criticisms import evaluate, ppc, psis_loo, waic
 from edward.inferences import Inference, MonteCarlo, VariationalInference, \
     MFVI, KLpq, MAP, Laplace
+from edward.serving import Predictor
 from edward.util import cumprod, dot, get_dims, get_session, hessian, \
     kl_multivariate_normal, log_sum_exp, logit, multivariate_rbf, rbf, \
     set_seed, softplus, stop_gradient, to_simplex
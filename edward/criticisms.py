@@ -2,14 +2,20 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import multiprocessing
 import numpy as np
 import six
 import tensorflow as tf
 
-from edward.util import logit, get_dims, get_session
+from edward.models import PosteriorSamples
+from edward.models.models import _process_context
+from edward.util import logit, get_dims, get_session, log_mean_exp, \
+    log_sum_exp
 
 
-def evaluate(metrics, model, variational, data, y_true=None, n_samples=100):
+def evaluate(metrics, model, variational, data, y_true=None, n_samples=100,
+             n_minibatch=None, n_samples_batch=None):
     """Evaluate fitted model using a set of metrics.
 
     Parameters
@@ -20,8 +26,9 @@ def evaluate(metrics, model, variational, data, y_true=None, n_samples=100):
         Probability model, a class object with an implemented
         ``predict`` method. PyMC3 and Stan models do not currently
         support this method.
-    variational : ed.Variational
-        Variational approximation to the posterior p(z | x)
+    variational : ed.Variational or ed.PosteriorSamples
+        Variational approximation to the posterior p(z | x), or a
+        fixed bank of samples from it.
     data : dict
         Data dictionary to evaluate model with. For TensorFlow,
         Python, and Stan models, the key type is a string; for PyMC3,
@@ -34,6 +41,19 @@ def evaluate(metrics, model, variational, data, y_true=None, n_samples=100):
     n_samples : int, optional
         Number of posterior samples for making predictions,
         using the posterior predictive distribution.
+    n_minibatch : int, optional
+        Number of data points to evaluate at a time. If specified,
+        the data is streamed through the model in chunks of this
+        size, keeping a running accumulator for each metric. All
+        values in ``data``, and ``y_true``, must then be NumPy arrays
+        whose outer dimension indexes data points.
+    n_samples_batch : int, optional
+        Number of posterior samples to predict with at a time, when
+        streaming. It must divide ``n_samples``. Predictions are
+        averaged over batches; log-likelihoods are combined with a
+        log-mean-exp, so for the 'log_lik' metric ``predict`` must
+        return the log-mean-exp over samples of the per-sample
+        log-likelihoods. Default is all ``n_samples`` at once.
 
     Returns
     -------
@@ -44,7 +64,29 @@ def evaluate(metrics, model, variational, data, y_true=None, n_samples=100):
     ------
     NotImplementedError
         If an input metric does not match an implemented metric in Edward.
+
+    Notes
+    -----
+    When streaming, all chunks of data are evaluated with the same
+    posterior samples, which are drawn once at the start. Metrics
+    which average over data points are weighted by the size of each
+    chunk, and those which sum over them are summed; the result equals
+    evaluating all data at once. The log-likelihood is returned for
+    all data points, concatenated along the dimension of the model's
+    output which indexes them.
     """
+    if isinstance(metrics, str):
+        metrics = [metrics]
+
+    if n_minibatch is not None or n_samples_batch is not None:
+        evaluations = _evaluate_streaming(metrics, model, variational, data,
+                                          y_true, n_samples, n_minibatch,
+                                          n_samples_batch)
+        if len(evaluations) == 1:
+            return evaluations[0]
+        else:
+            return evaluations
+
     sess = get_session()
     # Monte Carlo estimate the mean of the posterior predictive:
     # 1. Sample a batch of latent variables from posterior
@@ -52,64 +94,193 @@ def evaluate(metrics, model, variational, data, y_true=None, n_samples=100):
     # 2. Make predictions, averaging over each sample of latent variables
     y_pred = model.predict(data, zs)
 
-    # Evaluate y_pred according to y_true for all metrics.
-    evaluations = []
-    if isinstance(metrics, str):
-        metrics = [metrics]
+    # Evaluate y_pred according to y_true for all metrics. All metrics
+    # are built on the same predictions and fetched in a single run,
+    # so they share one set of posterior samples.
+    evaluations = sess.run([_build_metric(metric, y_true, y_pred)
+                            for metric in metrics])
+    if len(evaluations) == 1:
+        return evaluations[0]
+    else:
+        return evaluations
+
 
+def _evaluate_streaming(metrics, model, variational, data, y_true,
+                        n_samples, n_minibatch, n_samples_batch):
+    """Evaluate metrics over chunks of data and batches of posterior
+    samples; see ``evaluate``."""
+    sess = get_session()
+    if n_samples_batch is None:
+        n_samples_batch = n_samples
+    if n_samples % n_samples_batch != 0:
+        raise ValueError("n_samples must be a multiple of n_samples_batch.")
+
+    N = len(list(six.itervalues(data))[0])
+    if n_minibatch is None:
+        n_minibatch = N
+
+    # Build the prediction and metrics once, on placeholders which are
+    # fed a chunk of data and predictions at a time.
+    x_ph = {key: tf.placeholder(tf.as_dtype(value.dtype),
+                                (None, ) + value.shape[1:])
+            for key, value in six.iteritems(data)}
+    zs = variational.sample(n_samples_batch)
+    if not isinstance(zs, list):
+        zs = [zs]
+
+    y_pred = model.predict(x_ph, zs[0] if len(zs) == 1 else zs)
+    y_pred_ph = tf.placeholder(tf.float32, y_pred.get_shape())
+    if y_true is not None:
+        y_true_ph = tf.placeholder(tf.as_dtype(y_true.dtype),
+                                   (None, ) + y_true.shape[1:])
+    else:
+        y_true_ph = None
+
+    # Pairs of each metric's name and tensor; the log-likelihood is
+    # accumulated from the predictions directly.
+    names = []
+    tensors = []
     for metric in metrics:
         if metric == 'accuracy' or metric == 'crossentropy':
-            # automate binary or sparse cat depending on max(y_true)
-            support = tf.reduce_max(y_true).eval()
-            if support <= 1:
-                metric = 'binary_' + metric
-            else:
-                metric = 'sparse_categorical_' + metric
-
-        if metric == 'binary_accuracy':
-            evaluations += [sess.run(binary_accuracy(y_true, y_pred))]
-        elif metric == 'categorical_accuracy':
-            evaluations += [sess.run(categorical_accuracy(y_true, y_pred))]
-        elif metric == 'sparse_categorical_accuracy':
-            evaluations += [sess.run(sparse_categorical_accuracy(y_true, y_pred))]
-        elif metric == 'log_loss' or metric == 'binary_crossentropy':
-            evaluations += [sess.run(binary_crossentropy(y_true, y_pred))]
-        elif metric == 'categorical_crossentropy':
-            evaluations += [sess.run(categorical_crossentropy(y_true, y_pred))]
-        elif metric == 'sparse_categorical_crossentropy':
-            evaluations += [sess.run(sparse_categorical_crossentropy(y_true, y_pred))]
-        elif metric == 'hinge':
-            evaluations += [sess.run(hinge(y_true, y_pred))]
-        elif metric == 'squared_hinge':
-            evaluations += [sess.run(squared_hinge(y_true, y_pred))]
-        elif metric == 'mse' or metric == 'MSE' or \
-             metric == 'mean_squared_error':
-            evaluations += [sess.run(mean_squared_error(y_true, y_pred))]
-        elif metric == 'mae' or metric == 'MAE' or \
-             metric == 'mean_absolute_error':
-            evaluations += [sess.run(mean_absolute_error(y_true, y_pred))]
-        elif metric == 'mape' or metric == 'MAPE' or \
-             metric == 'mean_absolute_percentage_error':
-            evaluations += [sess.run(mean_absolute_percentage_error(y_true, y_pred))]
-        elif metric == 'msle' or metric == 'MSLE' or \
-             metric == 'mean_squared_logarithmic_error':
-            evaluations += [sess.run(mean_squared_logarithmic_error(y_true, y_pred))]
-        elif metric == 'poisson':
-            evaluations += [sess.run(poisson(y_true, y_pred))]
-        elif metric == 'cosine' or metric == 'cosine_proximity':
-            evaluations += [sess.run(cosine_proximity(y_true, y_pred))]
-        elif metric == 'log_lik' or metric == 'log_likelihood':
-            evaluations += [sess.run(y_pred)]
+            metric = _classification_type(y_true, None) + metric
+        if metric == 'log_likelihood':
+            metric = 'log_lik'
+
+        names += [metric]
+        if metric != 'log_lik':
+            tensors += [(metric, _build_metric(metric, y_true_ph, y_pred_ph))]
+
+    # Draw all posterior samples once, so that every chunk of data is
+    # evaluated with the same samples.
+    if isinstance(variational, PosteriorSamples):
+        z_batches = [_flatten(z_batch) for z_batch in
+                     variational.batches(n_samples_batch, n_samples)]
+    else:
+        zs_identity = [tf.identity(z) for z in zs]
+        z_batches = [sess.run(zs_identity)
+                     for _ in range(n_samples // n_samples_batch)]
+
+    n_batches = len(z_batches)
+
+    totals = [0.0] * len(tensors)
+    log_liks = []
+    for start in range(0, N, n_minibatch):
+        stop = min(start + n_minibatch, N)
+        feed_dict = {x_ph[key]: value[start:stop]
+                     for key, value in six.iteritems(data)}
+        # Keep running accumulators over batches of samples, so that
+        # memory does not grow with the number of samples. Predictions
+        # are summed, and log-likelihoods are combined by a running
+        # log-sum-exp, shifted by the largest value seen so far.
+        y_pred_sum = 0.0
+        log_lik_max = None
+        log_lik_sum = 0.0
+        for z_batch in z_batches:
+            feed_dict.update(zip(zs, z_batch))
+            y_pred_val = sess.run(y_pred, feed_dict)
+            y_pred_sum = y_pred_sum + y_pred_val
+            if 'log_lik' in names:
+                if log_lik_max is None:
+                    log_lik_max = y_pred_val
+                else:
+                    new_max = np.maximum(log_lik_max, y_pred_val)
+                    log_lik_sum = log_lik_sum * np.exp(log_lik_max - new_max)
+                    log_lik_max = new_max
+
+                log_lik_sum = log_lik_sum + np.exp(y_pred_val - log_lik_max)
+
+        if 'log_lik' in names:
+            # The log-mean-exp over batches equals that over all
+            # samples, as each batch's log-likelihood is a log-mean-exp
+            # over its samples.
+            log_liks += [log_lik_max + np.log(log_lik_sum / n_batches)]
+
+        if len(tensors) > 0:
+            feed_dict = {y_pred_ph: y_pred_sum / n_batches}
+            if y_true is not None:
+                feed_dict[y_true_ph] = y_true[start:stop]
+
+            values = sess.run([tensor for _, tensor in tensors], feed_dict)
+            for i, ((name, _), value) in enumerate(zip(tensors, values)):
+                if name in _SUM_METRICS:
+                    totals[i] += value
+                else:
+                    totals[i] += value * (stop - start) / N
+
+    evaluations = []
+    totals = iter(totals)
+    for name in names:
+        if name == 'log_lik':
+            evaluations += [np.concatenate(
+                log_liks, _data_axis(log_liks[0], min(n_minibatch, N)))]
         else:
-            raise NotImplementedError()
+            evaluations += [next(totals)]
 
-    if len(evaluations) == 1:
-        return evaluations[0]
+    return evaluations
+
+
+def _data_axis(value, n):
+    """Return the axis of ``value`` which indexes ``n`` data points:
+    the outer dimension if it has size ``n``, otherwise the inner
+    dimension."""
+    if value.shape[0] == n:
+        return 0
+    elif value.shape[-1] == n:
+        return len(value.shape) - 1
     else:
-        return evaluations
+        raise ValueError("Could not determine which dimension of the "
+                         "log-likelihood indexes data points.")
+
+
+def _build_metric(metric, y_true, y_pred):
+    """Build the tensor for a metric given by its name.
+
+    Raises
+    ------
+    NotImplementedError
+        If the metric does not match an implemented metric in Edward.
+    """
+    if metric == 'accuracy' or metric == 'crossentropy':
+        metric = _classification_type(y_true, y_pred) + metric
+
+    if metric == 'log_lik' or metric == 'log_likelihood':
+        return y_pred
+
+    try:
+        metric_fn = _METRICS[metric]
+    except KeyError:
+        raise NotImplementedError("Metric {} is not implemented.".format(metric))
+
+    return metric_fn(y_true, y_pred)
+
+
+def _classification_type(y_true, y_pred):
+    """Automate binary or sparse categorical metrics for accuracy and
+    cross-entropy, returning the prefix of the metric's name."""
+    if isinstance(y_true, tf.Tensor) or isinstance(y_true, tf.Variable):
+        # Sparse labels have one dimension fewer than the predicted
+        # probabilities. This avoids evaluating ``y_true``, except
+        # when the ranks are not known statically.
+        true_ndims = y_true.get_shape().ndims
+        pred_ndims = y_pred.get_shape().ndims
+        if true_ndims is not None and pred_ndims is not None:
+            if pred_ndims == true_ndims + 1:
+                return 'sparse_categorical_'
+            else:
+                return 'binary_'
+
+        support = get_session().run(tf.reduce_max(y_true))
+    else:
+        support = np.max(y_true)
+
+    if support <= 1:
+        return 'binary_'
+    else:
+        return 'sparse_categorical_'
 
 
-def ppc(model, variational=None, data=None, T=None, n_samples=100):
+def ppc(model, variational=None, data=None, T=None, n_samples=100,
+        batch=False, chunk_size=None, n_jobs=1):
     """Posterior predictive check.
     (Rubin, 1984; Meng, 1994; Gelman, Meng, and Stern, 1996)
     If no posterior approximation is provided through ``variational``,
@@ -132,10 +303,11 @@ def ppc(model, variational=None, data=None, T=None, n_samples=100):
         provided (i.e., a prior predictive check), ``model`` must also
         have a ``sample_prior`` method. PyMC3 and Stan models do not
         currently support either method.
-    variational : ed.Variational, optional
+    variational : ed.Variational or ed.PosteriorSamples, optional
         Latent variable distribution q(z) to sample from. It is an
         approximation to the posterior, e.g., a variational
-        approximation or an empirical distribution from MCMC samples.
+        approximation or an empirical distribution from MCMC samples,
+        or a fixed bank of samples from it.
     data : dict, optional
         Observed data to compare to. If not specified, will return
         only the reference distribution with an assumed replicated
@@ -151,6 +323,28 @@ def ppc(model, variational=None, data=None, T=None, n_samples=100):
         is the identity function.
     n_samples : int, optional
         Number of replicated data sets.
+    batch : bool, optional
+        Whether to replicate data and calculate the discrepancy
+        batched over replicates, in a single graph whose size does
+        not depend on ``n_samples``. This requires ``sample_likelihood``
+        (and ``sample_prior``) to build tensors in the graph:
+        ``sample_likelihood`` takes a tensor of latent variables and
+        returns one data dictionary whose values have an outer
+        dimension of size ``n_samples``. ``T`` takes such a data
+        dictionary and the latent variables, and returns a vector of
+        one discrepancy per replicate. The observed data is passed
+        into ``T`` with an outer dimension of size 1, which broadcasts
+        against the latent variables.
+    chunk_size : int, optional
+        Number of replicated data sets to draw at a time. Each chunk
+        is reduced to its discrepancies before the next is drawn, so
+        peak memory does not grow with ``n_samples``. Default is to
+        draw all replicates at once.
+    n_jobs : int, optional
+        Number of processes which draw chunks of replicates in
+        parallel, for models whose ``sample_likelihood`` works on
+        NumPy arrays. The model must be picklable. If -1, use as many
+        processes as CPUs.
 
     Returns
     -------
@@ -170,7 +364,19 @@ def ppc(model, variational=None, data=None, T=None, n_samples=100):
         If the discrepancy function is not specified, then the list
         contains the full data distribution where each element is a
         data set (dictionary).
+
+    Raises
+    ------
+    ValueError
+        If ``n_jobs`` is neither positive nor -1.
     """
+    if n_jobs < 1 and n_jobs != -1:
+        raise ValueError("n_jobs must be positive or -1, got {}.".format(
+            n_jobs))
+
+    if batch:
+        return _ppc_batch(model, variational, data, T, n_samples)
+
     sess = get_session()
     if data is None:
         N = 1
@@ -183,7 +389,9 @@ def ppc(model, variational=None, data=None, T=None, n_samples=100):
     # 1. Sample from posterior (or prior).
     # We fetch zs out of the session because sample_likelihood() may
     # require a SciPy-based sampler.
-    if variational is not None:
+    if isinstance(variational, PosteriorSamples):
+        zs = variational.values(n_samples)
+    elif variational is not None:
         zs = variational.sample(n_samples)
         # `tf.identity()` is to avoid fetching, e.g., a placeholder x
         # when feeding the dictionary {x: np.array()}. TensorFlow will
@@ -198,27 +406,396 @@ def ppc(model, variational=None, data=None, T=None, n_samples=100):
         zs = model.sample_prior(n_samples)
         zs = sess.run(zs)
 
-    # 2. Sample from likelihood.
-    xreps = model.sample_likelihood(zs, N)
+    # 2. Sample from likelihood, a chunk of replicates at a time.
+    if chunk_size is None:
+        chunk_size = n_samples
+
+    xreps_chunks = _sample_likelihood_chunks(model, zs, N, n_samples,
+                                             chunk_size, n_jobs)
 
     # 3. Calculate discrepancy.
     if T is None:
-        if x is None:
+        xreps = []
+        for xreps_chunk in xreps_chunks:
+            xreps += xreps_chunk
+
+        if data is None:
             return xreps
         else:
             return [xreps, x]
 
+    # The discrepancies are built once, for a chunk of replicates on
+    # placeholders, and each chunk is reduced to its discrepancies as
+    # soon as it is drawn. Only one chunk of replicated data sets is
+    # held in memory at a time.
     Txreps = []
     Txs = []
-    for xrep, z in zip(xreps, tf.unpack(zs)):
-        Txreps += [T(xrep, z)]
-        if x is not None:
-            Txs += [T(x, z)]
+    start = 0
+    for xreps_chunk in xreps_chunks:
+        xreps_chunk = _fetch(xreps_chunk)
+        if start == 0:
+            xrep_phs, z_phs, x_ph, Txreps_t, Txs_t = _build_discrepancies(
+                T, xreps_chunk[0], _take(zs, 0), data, chunk_size)
+
+        n = len(xreps_chunk)
+        feed_dict = {}
+        for i, xrep in enumerate(xreps_chunk):
+            for key, value in six.iteritems(xrep):
+                feed_dict[xrep_phs[i][key]] = value
+
+            feed_dict.update(zip(_flatten(z_phs[i]),
+                                 _flatten(_take(zs, start + i))))
+
+        if data is None:
+            Txreps += sess.run(Txreps_t[:n], feed_dict)
+        else:
+            for key, value in six.iteritems(x_ph):
+                feed_dict[value] = data[key]
+
+            values = sess.run(Txreps_t[:n] + Txs_t[:n], feed_dict)
+            Txreps += values[:n]
+            Txs += values[n:]
+
+        start += n
+
+    if data is None:
+        return np.array(Txreps)
+    else:
+        return [np.array(Txreps), np.array(Txs)]
+
+
+def _sample_likelihood_chunks(model, zs, N, n_samples, chunk_size, n_jobs):
+    """Generate replicated data sets, ``chunk_size`` at a time.
+
+    If ``n_jobs`` is not 1, chunks are drawn in parallel by a pool of
+    processes, with at most ``n_jobs`` chunks in flight.
+    """
+    starts = range(0, n_samples, chunk_size)
+    if n_jobs == 1:
+        for start in starts:
+            yield model.sample_likelihood(
+                _take(zs, slice(start, start + chunk_size)), N)
+
+        return
+
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+
+    pool = _process_context().Pool(n_jobs)
+    try:
+        pending = collections.deque()
+        for start in starts:
+            args = (model, _take(zs, slice(start, start + chunk_size)), N)
+            pending.append(pool.apply_async(_call_sample_likelihood, (args, )))
+            if len(pending) >= n_jobs:
+                yield pending.popleft().get()
+
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def _call_sample_likelihood(args):
+    """Call ``sample_likelihood`` in a worker process."""
+    model, zs, N = args
+    return model.sample_likelihood(zs, N)
+
+
+def _build_discrepancies(T, xrep, z, data, chunk_size):
+    """Build the discrepancies of ``chunk_size`` replicated data sets
+    and of the observed data, on placeholders shaped like ``xrep``,
+    ``z`` and ``data``."""
+    def placeholder(value):
+        value = np.asarray(value)
+        return tf.placeholder(tf.as_dtype(value.dtype), value.shape)
+
+    xrep_phs = []
+    z_phs = []
+    Txreps = []
+    Txs = []
+    if data is not None:
+        # Feed NumPy data at run time rather than embedding a copy of
+        # it in the graph for each replicate.
+        x_ph = {key: placeholder(value) for key, value in
+                six.iteritems(data) if isinstance(value, np.ndarray)}
+        x = {key: x_ph.get(key, value) for key, value in six.iteritems(data)}
+    else:
+        x_ph = {}
+
+    for _ in range(chunk_size):
+        xrep_ph = {key: placeholder(value) for key, value in
+                   six.iteritems(xrep)}
+        if isinstance(z, list):
+            z_ph = [placeholder(z_elem) for z_elem in z]
+        else:
+            z_ph = placeholder(z)
 
-    if x is None:
-        return sess.run(tf.pack(Txreps))
+        xrep_phs += [xrep_ph]
+        z_phs += [z_ph]
+        Txreps += [T(xrep_ph, z_ph)]
+        if data is not None:
+            Txs += [T(x, z_ph)]
+
+    return xrep_phs, z_phs, x_ph, Txreps, Txs
+
+
+def _take(zs, idx):
+    """Index the latent variables along their outer dimension."""
+    if isinstance(zs, list):
+        return [zs_elem[idx] for zs_elem in zs]
+    else:
+        return zs[idx]
+
+
+def _flatten(zs):
+    if isinstance(zs, list):
+        return zs
+    else:
+        return [zs]
+
+
+def _fetch(xreps):
+    """Evaluate any tensors in a list of data dictionaries, in a single
+    run."""
+    tensors = [value for xrep in xreps for value in six.itervalues(xrep)
+               if isinstance(value, tf.Tensor)]
+    if len(tensors) == 0:
+        return xreps
+
+    values = dict(zip(tensors, get_session().run(tensors)))
+    return [{key: values.get(value, value) if isinstance(value, tf.Tensor)
+             else value for key, value in six.iteritems(xrep)}
+            for xrep in xreps]
+
+
+def _ppc_batch(model, variational, data, T, n_samples):
+    """Posterior predictive check batched over replicates; see
+    ``ppc``."""
+    sess = get_session()
+    if data is None:
+        N = 1
     else:
-        return sess.run([tf.pack(Txreps), tf.pack(Txs)])
+        N = get_dims(list(six.itervalues(data))[0])[0]
+
+    if variational is not None:
+        zs = variational.sample(n_samples)
+    else:
+        zs = model.sample_prior(n_samples)
+
+    xreps = model.sample_likelihood(zs, N)
+    if T is None:
+        if data is None:
+            return sess.run(xreps)
+        else:
+            return [sess.run(xreps), data]
+
+    Txreps = T(xreps, zs)
+    if data is None:
+        return sess.run(Txreps)
+
+    # Give the observed data a replicate dimension of size 1. The
+    # discrepancy broadcasts it across replicates if it depends on
+    # the latent variables, and we tile it otherwise.
+    x = {key: tf.expand_dims(value, 0) for key, value in six.iteritems(data)}
+    Txs = T(x, zs) + tf.zeros([n_samples])
+    return sess.run([Txreps, Txs])
+
+
+def waic(log_lik, chunk_size=None):
+    """Widely applicable information criterion (Watanabe, 2010).
+
+    .. math::
+        WAIC = -2 \sum_{i=1}^N ( \log E_{p(z | x)}[ p(x_i | z) ]
+                                - Var_{p(z | x)}[ \log p(x_i | z) ] )
+
+    It estimates the expected log predictive density of new data,
+    on the deviance scale; lower is better.
+
+    Parameters
+    ----------
+    log_lik : np.ndarray or tf.Tensor
+        Matrix of shape (n_samples x N) of pointwise log-likelihoods,
+        where each row is evaluated at a posterior sample of the
+        latent variables and each column at a data point.
+    chunk_size : int, optional
+        Number of data points to process at a time, so that memory
+        scales with ``n_samples x chunk_size``. Default is all data
+        points at once.
+
+    Returns
+    -------
+    tuple of float
+        The estimate and its standard error.
+    """
+    elpd = _pointwise_criterion(log_lik, chunk_size, _waic_chunk)
+    return _deviance(elpd)
+
+
+def psis_loo(log_lik, chunk_size=None):
+    """Leave-one-out cross-validation by Pareto-smoothed importance
+    sampling (Vehtari et al., 2017).
+
+    .. math::
+        LOO = -2 \sum_{i=1}^N \log p(x_i | x_{-i})
+
+    Each leave-one-out predictive density is estimated by importance
+    sampling from the full posterior, with the largest importance
+    weights for each data point smoothed by fitting a generalized
+    Pareto distribution. This avoids refitting the model N times.
+
+    Parameters
+    ----------
+    log_lik : np.ndarray or tf.Tensor
+        Matrix of shape (n_samples x N) of pointwise log-likelihoods,
+        where each row is evaluated at a posterior sample of the
+        latent variables and each column at a data point.
+    chunk_size : int, optional
+        Number of data points to process at a time, so that memory
+        scales with ``n_samples x chunk_size``. Default is all data
+        points at once.
+
+    Returns
+    -------
+    tuple
+        The estimate on the deviance scale, its standard error, and a
+        NumPy vector of the estimated Pareto shape parameter for each
+        data point. Estimates for data points with shape above 0.7
+        are unreliable.
+    """
+    ks = []
+
+    def psis_chunk(graph, log_lik_chunk):
+        log_weights, k = _psis_smooth(-log_lik_chunk)
+        ks.append(k)
+        return get_session().run(graph['loo'],
+                                 {graph['log_lik']: log_lik_chunk,
+                                  graph['log_weights']: log_weights})
+
+    elpd = _pointwise_criterion(log_lik, chunk_size, psis_chunk)
+    return _deviance(elpd) + (np.concatenate(ks), )
+
+
+def _pointwise_criterion(log_lik, chunk_size, criterion_chunk):
+    """Evaluate the pointwise expected log predictive density, a chunk
+    of data points at a time.
+
+    ``criterion_chunk(graph, log_lik_chunk)`` returns the pointwise
+    values for a chunk of columns of the log-likelihood matrix, using
+    the graph of pointwise criteria built once for all chunks.
+    """
+    if isinstance(log_lik, tf.Tensor) or isinstance(log_lik, tf.Variable):
+        log_lik = get_session().run(log_lik)
+
+    n_samples, N = log_lik.shape
+    if chunk_size is None:
+        chunk_size = N
+
+    graph = _build_criteria(n_samples)
+    elpd = []
+    for start in range(0, N, chunk_size):
+        log_lik_chunk = np.asarray(log_lik[:, start:(start + chunk_size)],
+                                   dtype=np.float32)
+        elpd += [criterion_chunk(graph, log_lik_chunk)]
+
+    return np.concatenate(elpd)
+
+
+def _waic_chunk(graph, log_lik_chunk):
+    return get_session().run(graph['waic'],
+                             {graph['log_lik']: log_lik_chunk})
+
+
+def _build_criteria(n_samples):
+    """Build the pointwise criteria on placeholders for a chunk of
+    columns of the log-likelihood matrix."""
+    log_lik = tf.placeholder(tf.float32, [n_samples, None])
+    # WAIC: log pointwise predictive density, less the posterior
+    # variance of the log-likelihood.
+    lppd = log_mean_exp(log_lik, 0)
+    mean = tf.reduce_mean(log_lik, 0, keep_dims=True)
+    p_waic = tf.reduce_sum(tf.square(log_lik - mean), 0) / \
+        (n_samples - 1.0)
+    # PSIS-LOO: importance sampling estimate with the smoothed,
+    # normalized log-weights.
+    log_weights = tf.placeholder(tf.float32, [n_samples, None])
+    loo = log_sum_exp(log_weights + log_lik, 0)
+    return {'log_lik': log_lik,
+            'log_weights': log_weights,
+            'waic': tf.reshape(lppd - p_waic, [-1]),
+            'loo': tf.reshape(loo, [-1])}
+
+
+def _deviance(elpd):
+    """Sum pointwise expected log predictive densities on the deviance
+    scale, with the standard error of the sum."""
+    N = elpd.shape[0]
+    return -2.0 * np.sum(elpd), 2.0 * np.sqrt(N * np.var(elpd))
+
+
+def _psis_smooth(log_ratios):
+    """Pareto-smooth importance ratios, independently for each column.
+
+    Returns the normalized log-weights and the estimated Pareto shape
+    parameter ``k`` of each column.
+    """
+    n_samples, n_cols = log_ratios.shape
+    log_weights = log_ratios - np.max(log_ratios, 0)
+    k = np.zeros(n_cols) + np.inf
+    # Length of the tail to smooth; too short a tail cannot be fit.
+    M = int(np.ceil(min(0.2 * n_samples, 3.0 * np.sqrt(n_samples))))
+    if M >= 5:
+        cols = np.arange(n_cols)
+        order = np.argsort(log_weights, 0)
+        sorted_log_weights = log_weights[order, cols]
+        cutoff = sorted_log_weights[n_samples - M - 1]
+        tail = np.exp(sorted_log_weights[(n_samples - M):]) - np.exp(cutoff)
+        k, sigma = _gpd_fit(tail)
+        # Replace the tail by the expected order statistics of the
+        # fitted distribution, and truncate at the largest raw weight.
+        p = (np.arange(M) + 0.5) / M
+        smoothed = np.log(_gpd_inverse(p[:, np.newaxis], k, sigma) +
+                          np.exp(cutoff))
+        log_weights[order[(n_samples - M):], cols] = smoothed
+        log_weights = np.minimum(log_weights, 0.0)
+
+    log_weights -= np.log(np.sum(np.exp(log_weights), 0))
+    return log_weights.astype(np.float32), k
+
+
+def _gpd_fit(x):
+    """Estimate the parameters of generalized Pareto distributions,
+    one for each column of ``x``, whose rows are sorted in ascending
+    order. This is the empirical Bayes estimate of Zhang and Stephens
+    (2009), with a weakly informative prior on the shape ``k``.
+
+    Returns the shape and scale of each column.
+    """
+    n = x.shape[0]
+    prior = 3.0
+    m = 30 + int(np.sqrt(n))
+    bs = 1.0 - np.sqrt(m / (np.arange(1, m + 1) - 0.5))
+    bs = bs[:, np.newaxis] / (prior * x[int(n / 4 + 0.5) - 1]) + 1.0 / x[-1]
+    ks = np.mean(np.log1p(-bs[:, np.newaxis, :] * x[np.newaxis, :, :]), 1)
+    L = n * (np.log(-bs / ks) - ks - 1.0)
+    # Posterior weight of each candidate b, computed without
+    # normalizing the likelihoods first; overflow yields zero weight.
+    with np.errstate(over='ignore'):
+        w = 1.0 / np.sum(np.exp(L[np.newaxis, :, :] - L[:, np.newaxis, :]), 1)
+    w /= np.sum(w, 0)
+    b = np.sum(bs * w, 0)
+    k = np.mean(np.log1p(-b * x), 0)
+    sigma = -k / b
+    a = 10.0
+    k = k * n / (n + a) + a * 0.5 / (n + a)
+    return k, sigma
+
+
+def _gpd_inverse(p, k, sigma):
+    """Quantile function of the generalized Pareto distribution."""
+    k_nonzero = np.where(k == 0.0, 1.0, k)
+    return np.where(k == 0.0, -sigma * np.log1p(-p),
+                    sigma * np.expm1(-k * np.log1p(-p)) / k_nonzero)
 
 
 # Classification metrics
@@ -435,3 +1012,34 @@ def cosine_proximity(y_true, y_pred):
     y_true = tf.nn.l2_normalize(y_true, len(y_true.get_shape()) - 1)
     y_pred = tf.nn.l2_normalize(y_pred, len(y_pred.get_shape()) - 1)
     return tf.reduce_sum(y_true * y_pred)
+
+
+_METRICS = {
+    'binary_accuracy': binary_accuracy,
+    'categorical_accuracy': categorical_accuracy,
+    'sparse_categorical_accuracy': sparse_categorical_accuracy,
+    'log_loss': binary_crossentropy,
+    'binary_crossentropy': binary_crossentropy,
+    'categorical_crossentropy': categorical_crossentropy,
+    'sparse_categorical_crossentropy': sparse_categorical_crossentropy,
+    'hinge': hinge,
+    'squared_hinge': squared_hinge,
+    'mse': mean_squared_error,
+    'MSE': mean_squared_error,
+    'mean_squared_error': mean_squared_error,
+    'mae': mean_absolute_error,
+    'MAE': mean_absolute_error,
+    'mean_absolute_error': mean_absolute_error,
+    'mape': mean_absolute_percentage_error,
+    'MAPE': mean_absolute_percentage_error,
+    'mean_absolute_percentage_error': mean_absolute_percentage_error,
+    'msle': mean_squared_logarithmic_error,
+    'MSLE': mean_squared_logarithmic_error,
+    'mean_squared_logarithmic_error': mean_squared_logarithmic_error,
+    'poisson': poisson,
+    'cosine': cosine_proximity,
+    'cosine_proximity': cosine_proximity,
+}
+
+# Metrics which sum rather than average over data points.
+_SUM_METRICS = set(['poisson', 'cosine', 'cosine_proximity'])
@@ -4,11 +4,16 @@ from __future__ import print_function
 
 import multiprocessing
 import numpy as np
+import os
 import six
 import tensorflow as tf
+import threading
+import time
 
-from edward.models import StanModel, Variational, PointMass
+from edward.models import PyMC3Model, PythonModel, StanModel, \
+    Variational, PointMass, has_kl, kl_divergence
 from edward.util import get_dims, get_session, hessian, kl_multivariate_normal, log_sum_exp, stop_gradient
+from scipy import optimize
 
 try:
     import prettytensor as pt
@@ -52,9 +57,14 @@ class Inference(object):
            TensorFlow placeholders (and manually feeds them);
         3. externally if user passes in data as TensorFlow tensors
            which are the outputs of data readers.
+
+        For Python and PyMC3 models, NumPy arrays are kept as is and
+        bound by reference in the model's Python function, rather
+        than copied from TensorFlow at every step. They are stored in
+        the computational graph only if the data is subsampled.
         """
-        sess = get_session()
         self.model = model
+        self._data_variables = {}
         if data is None:
             data = {}
 
@@ -77,15 +87,96 @@ class Inference(object):
                     # according to the reader.
                     self.data[key] = value
                 elif isinstance(value, np.ndarray):
-                    # If ``data`` has NumPy arrays, store the data
-                    # in the computational graph.
-                    placeholder = tf.placeholder(tf.float32, value.shape)
-                    var = tf.Variable(placeholder, trainable=False, collections=[])
-                    self.data[key] = var
-                    sess.run(var.initializer, {placeholder: value})
+                    if isinstance(model, (PythonModel, PyMC3Model)):
+                        # If the model is written in Python, the data
+                        # is constant for the run; pass it by
+                        # reference.
+                        self.data[key] = value
+                    else:
+                        # If ``data`` has NumPy arrays, store the data
+                        # in the computational graph.
+                        self.data[key] = self._data_variable(key, value)
                 else:
                     raise NotImplementedError()
 
+        # Keep the data dictionary before any subsampling.
+        self._data = self.data
+
+    def assign_data(self, data):
+        """Assign new values to data passed in as NumPy arrays.
+
+        The new values must have the same shapes as the old ones. This
+        does not add to the computational graph, so that inference can
+        be re-run on new data of the same shape.
+
+        Parameters
+        ----------
+        data : dict
+            Data dictionary whose keys are a subset of the keys of the
+            data passed in at construction, and whose values are NumPy
+            arrays.
+
+        Raises
+        ------
+        NotImplementedError
+            If the model is a Stan model, or if a key's data was not
+            passed in as a NumPy array.
+        """
+        if isinstance(self.model, StanModel):
+            raise NotImplementedError("Stan models fix their data at "
+                                      "compile time.")
+
+        sess = get_session()
+        for key, value in six.iteritems(data):
+            if key in self._data_variables:
+                var, placeholder = self._data_variables[key]
+                sess.run(var.initializer, {placeholder: value})
+            elif isinstance(self._data.get(key), np.ndarray):
+                # The data is bound by reference in the model; replace
+                # the value in the same dictionary.
+                self._data[key] = value
+            else:
+                raise NotImplementedError()
+
+    def _data_variable(self, key, value):
+        """Store a NumPy array in the computational graph.
+
+        The array is fed into the initializer of a non-trainable
+        variable, which avoids embedding it as a constant in the graph
+        definition. The variable and its placeholder are kept in
+        ``self._data_variables`` for ``assign_data``.
+        """
+        sess = get_session()
+        placeholder = tf.placeholder(tf.float32, value.shape)
+        var = tf.Variable(placeholder, trainable=False, collections=[])
+        sess.run(var.initializer, {placeholder: value})
+        self._data_variables[key] = (var, placeholder)
+        return var
+
+
+def _get_variables(tensor):
+    """Get the variables in ``tf.all_variables()`` which ``tensor``
+    depends on.
+
+    Parameters
+    ----------
+    tensor : tf.Tensor
+
+    Returns
+    -------
+    list of tf.Variable
+    """
+    ops = set()
+    stack = [tensor.op]
+    while stack:
+        op = stack.pop()
+        if op not in ops:
+            ops.add(op)
+            stack.extend([x.op for x in op.inputs])
+            stack.extend(op.control_inputs)
+
+    return [var for var in tf.all_variables() if var.op in ops]
+
 
 class MonteCarlo(Inference):
     """Base class for Monte Carlo inference methods.
@@ -135,8 +226,10 @@ class VariationalInference(Inference):
         """A simple wrapper to run variational inference.
 
         1. Initialize via ``initialize``.
-        2. Run ``update`` for ``self.n_iter`` iterations.
-        3. While running, ``print_progress``.
+        2. Run ``update`` for ``self.n_iter`` iterations, starting
+           after the last checkpoint if resuming.
+        3. While running, ``print_progress``, ``record`` and
+           ``checkpoint``.
         4. Finalize via ``finalize``.
 
         Parameters
@@ -147,19 +240,35 @@ class VariationalInference(Inference):
             Passed into ``initialize``.
         """
         self.initialize(*args, **kwargs)
-        for t in range(self.n_iter+1):
+        for t in range(self.t_start, self.n_iter+1):
             loss = self.update()
             self.print_progress(t, loss)
+            self.record(t, loss)
+            self.checkpoint(t)
+            if self.n_converged >= self.patience:
+                if self.n_print is not None:
+                    print("converged at iter {:d}".format(t))
+
+                break
 
         self.finalize()
 
     def initialize(self, n_iter=1000, n_minibatch=None, n_print=100,
-        optimizer=None, scope=None):
+        optimizer=None, scope=None, warm_start=False, checkpoint_dir=None,
+        n_checkpoint=100, resume=False, sinks=None,
+        n_record=None, tol=None, tol_params=None, patience=1,
+        smoothing=0.9, learning_rate=None, clip_norm=None,
+        lr_multipliers=None):
         """Initialize variational inference algorithm.
 
-        Set up ``tf.train.AdamOptimizer`` with a decaying scale factor.
+        Build the loss function and set up the optimizer, by default
+        ``tf.train.AdamOptimizer`` with a decaying scale factor. If
+        this method was called before
+        with the same settings, the loss function and training
+        operation are reused rather than added to the graph again.
 
-        Initialize all variables.
+        Initialize the variables which the loss function depends on,
+        as well as the variables created by the optimizer.
 
         Parameters
         ----------
@@ -174,21 +283,172 @@ class VariationalInference(Inference):
         n_print : int, optional
             Number of iterations for each print progress. To suppress print
             progress, then specify None.
-        optimizer : str, optional
-            Whether to use TensorFlow optimizer or PrettyTensor
-            optimizer when using PrettyTensor. Defaults to TensorFlow.
+        optimizer : str or tf.train.Optimizer, optional
+            TensorFlow optimizer, either its name (one of 'sgd',
+            'momentum', 'adam', 'adagrad', 'adadelta', 'rmsprop' and
+            'ftrl') or an instance. 'PrettyTensor' instead uses the
+            PrettyTensor optimizer. Defaults to 'adam'.
         scope : str, optional
             Scope of TensorFlow variable objects to optimize over.
+        warm_start : bool, optional
+            Whether to keep the current values of variables that are
+            already initialized, e.g., from a previous run. The
+            optimizer's variables are always re-initialized.
+        checkpoint_dir : str, optional
+            Directory to save checkpoints to. A checkpoint holds the
+            variables which the loss function depends on, the
+            optimizer's variables, e.g., its slots, and the iteration
+            counter ``self.global_step``. Default is not to save
+            checkpoints.
+        n_checkpoint : int, optional
+            Number of iterations between checkpoints.
+        resume : bool, optional
+            Whether to restore the latest checkpoint in
+            ``checkpoint_dir``, if any, and continue from its
+            iteration.
+        sinks : list of ed.monitoring.Sink, optional
+            Sinks to write training records to, e.g., the loss, time
+            per iteration, throughput and summaries of the variational
+            parameters. They are fetched in the same session run as
+            the training step. Like the loss, the summaries are of the
+            parameters before the step. The caller owns the sinks:
+            ``finalize`` flushes them, and the caller closes them.
+        n_record : int, optional
+            Number of iterations for each record. Default is
+            ``n_print``.
+        tol : float, optional
+            Tolerance on the relative change of the exponentially
+            smoothed loss between iterations, below which inference
+            has converged. Default is not to check it.
+        tol_params : float, optional
+            Tolerance on the Euclidean norm of the change of all
+            optimized parameters between iterations, below which
+            inference has converged. Default is not to check it.
+        patience : int, optional
+            Number of consecutive iterations that must converge before
+            ``run`` stops early.
+        smoothing : float, optional
+            Decay of the exponential moving average of the loss.
+        learning_rate : float or function, optional
+            Learning rate for an optimizer given by name. A function
+            takes the iteration counter ``self.global_step`` and
+            returns the learning rate as a tensor, e.g., a schedule
+            from ``tf.train.exponential_decay``. Defaults to 0.1,
+            decaying by a factor of 0.9 every 100 iterations.
+        clip_norm : float, optional
+            Clip the gradients so that their global norm is at most
+            ``clip_norm``. Default is not to clip.
+        lr_multipliers : dict, optional
+            Multipliers of the learning rate for some variables. Each
+            key is either a variable or a string which matches the
+            variables whose name contains it, e.g., 'scale' for the
+            scale parameters of ``Normal`` layers. For an optimizer
+            given as an instance, the variables' gradients are scaled
+            instead.
+
+        Notes
+        -----
+        The position of the data subsampling queue is not saved in a
+        checkpoint. After resuming, minibatches are drawn from a
+        newly shuffled epoch of the data.
         """
         self.n_iter = n_iter
-        self.n_minibatch = n_minibatch
         self.n_print = n_print
+        self.checkpoint_dir = checkpoint_dir
+        self.n_checkpoint = n_checkpoint
+        self.sinks = [] if sinks is None else sinks
+        self.n_record = n_print if n_record is None else n_record
+        self.patience = patience
+
+        config = (n_minibatch, optimizer, scope, learning_rate, clip_norm,
+                  lr_multipliers) + self._graph_config()
+        if config != getattr(self, '_config', None):
+            # The input threads of a previous initialization fill
+            # queues which the new graph does not use.
+            self._stop_threads()
+            self._build(n_minibatch, optimizer, scope, learning_rate,
+                        clip_norm, lr_multipliers)
+            self._config = config
+
+        sess = get_session()
+        if warm_start:
+            is_initialized = sess.run(self._is_initialized)
+            init_vars = [var for var, init in
+                         zip(self.variables, is_initialized) if not init]
+            init_vars += self.optimizer_variables
+        else:
+            init_vars = self.variables + self.optimizer_variables
+
+        if len(init_vars) > 0:
+            # Run the variables' initializers directly rather than
+            # adding an initialization operation to the graph.
+            sess.run([var.initializer for var in init_vars])
+
+        self._wait_checkpoint()
+        if checkpoint_dir is not None:
+            if getattr(self, '_checkpoint_config', None) != self._config:
+                self._build_checkpoint()
+                self._checkpoint_config = self._config
+
+            if not os.path.exists(checkpoint_dir):
+                os.makedirs(checkpoint_dir)
+
+            path = tf.train.latest_checkpoint(checkpoint_dir)
+            if resume and path is not None:
+                self._restorer.restore(sess, path)
+
+        self.t_start = int(sess.run(self.global_step))
+        self._record_t = self.t_start - 1
+        self._record_time = time.time()
+        self.n_converged = 0
+        self._check = None
+        if tol is not None or tol_params is not None:
+            convergence_config = (self._config, tol, tol_params, smoothing)
+            if getattr(self, '_convergence_config', None) != \
+                    convergence_config:
+                self._build_convergence(tol, tol_params, smoothing)
+                self._convergence_config = convergence_config
+
+            sess.run([var.initializer
+                      for var in self._convergence_variables])
+            self._check = self._convergence_check
+
+        # Start input enqueue threads, unless they still run from a
+        # previous initialization with the same graph.
+        if getattr(self, 'coord', None) is None:
+            self.coord = tf.train.Coordinator()
+            self.threads = tf.train.start_queue_runners(coord=self.coord)
+
+    def _stop_threads(self):
+        """Stop the input enqueue threads, if any. This closes their
+        queues, which then cannot be used again."""
+        if getattr(self, 'coord', None) is not None:
+            self.coord.request_stop()
+            self.coord.join(self.threads)
+            self.coord = None
+            self.threads = None
+
+    def _build(self, n_minibatch, optimizer, scope, learning_rate=None,
+               clip_norm=None, lr_multipliers=None):
+        """Build the loss function and training operation.
+
+        Set ``self.variables`` to the variables which the loss function
+        depends on, ``self.var_list`` to those which are optimized, and
+        ``self.optimizer_variables`` to the variables created by the
+        optimizer, e.g., its slots and global step.
+        """
+        self.n_minibatch = n_minibatch
         self.loss = tf.constant(0.0)
+        self.data = self._data
 
         if n_minibatch is not None and not isinstance(self.model, StanModel):
             # Re-assign data to batch tensors, with size given by
-            # ``n_data``.
-            values = list(six.itervalues(self.data))
+            # ``n_data``. Only the batches are passed into models
+            # written in Python, so their data is now stored in the
+            # computational graph.
+            values = [self._data_variable(key, value)
+                      if isinstance(value, np.ndarray) else value
+                      for key, value in six.iteritems(self.data)]
             slices = tf.train.slice_input_producer(values)
             # By default use as many threads as CPUs.
             batches = tf.train.batch(slices, n_minibatch,
@@ -202,31 +462,231 @@ class VariationalInference(Inference):
                          zip(six.iterkeys(self.data), batches)}
 
         loss = self.build_loss()
-        if optimizer is None:
-            var_list = tf.get_collection(tf.GraphKeys.TRAINABLE_VARIABLES,
-                                         scope=scope)
-            # Use ADAM with a decaying scale factor.
-            global_step = tf.Variable(0, trainable=False)
-            starter_learning_rate = 0.1
-            learning_rate = tf.train.exponential_decay(starter_learning_rate,
-                                                global_step,
-                                                100, 0.9, staircase=True)
-            optimizer = tf.train.AdamOptimizer(learning_rate)
-            self.train = optimizer.minimize(loss, global_step=global_step,
-                                            var_list=var_list)
+        variables = _get_variables(loss)
+        old_variables = set(tf.all_variables())
+        # Count the iterations run, for the learning rate's decay and
+        # for resuming from checkpoints.
+        global_step = tf.Variable(0, trainable=False)
+        var_list = [var for var in
+                    tf.get_collection(tf.GraphKeys.TRAINABLE_VARIABLES,
+                                      scope=scope)
+                    if var in variables]
+        if optimizer != 'PrettyTensor':
+            self.train = self._build_train(loss, var_list, global_step,
+                                           optimizer, learning_rate,
+                                           clip_norm, lr_multipliers)
         else:
             if scope is not None:
                 raise NotImplementedError("PrettyTensor optimizer does not accept a variable scope.")
 
             optimizer = tf.train.AdamOptimizer(0.01, epsilon=1.0)
-            self.train = pt.apply_optimizer(optimizer, losses=[loss])
+            self.train = tf.group(pt.apply_optimizer(optimizer, losses=[loss]),
+                                  tf.assign_add(global_step, 1))
+
+        self.global_step = global_step
+        self.variables = variables
+        self.var_list = var_list
+        self._objective = loss
+        self.optimizer_variables = [var for var in tf.all_variables()
+                                    if var not in old_variables]
+        if len(self.variables) > 0:
+            self._is_initialized = tf.pack([tf.is_variable_initialized(var)
+                                            for var in self.variables])
+        else:
+            self._is_initialized = tf.constant([], dtype=tf.bool)
+
+        # Number of data points per iteration, for the throughput. It
+        # is left out if no data value has a known outer dimension,
+        # e.g., placeholders of unknown shape.
+        self._batch_size = n_minibatch
+        if n_minibatch is None and not isinstance(self.model, StanModel):
+            for value in six.itervalues(self._data):
+                if isinstance(value, np.ndarray):
+                    dims = list(value.shape)
+                elif value.get_shape().ndims is not None:
+                    dims = value.get_shape().as_list()
+                else:
+                    continue
+
+                if len(dims) > 0 and dims[0] is not None:
+                    self._batch_size = dims[0]
+                    break
+
+        # Summaries of the variational parameters, for records. They
+        # read the same values of the variables as the loss, i.e., the
+        # values before the training step of the session run.
+        self._summaries = []
+        for l, layer in enumerate(self.variational.layers):
+            for name in layer.param_names:
+                param = tf.to_float(getattr(layer, name))
+                mean = tf.reduce_mean(param)
+                std = tf.sqrt(tf.reduce_mean(tf.square(param - mean)))
+                key = 'layer{}/{}'.format(l, name)
+                self._summaries += [(key + '/mean', mean),
+                                    (key + '/std', std)]
+
+    def _build_train(self, loss, var_list, global_step, optimizer,
+                     learning_rate, clip_norm, lr_multipliers):
+        """Build the training operation for a TensorFlow optimizer.
+
+        Variables whose learning rate has a different multiplier are
+        updated by separate optimizers, so that the multiplier scales
+        each step for adaptive optimizers such as ADAM, whose steps do
+        not depend on the scale of the gradients.
+        """
+        if optimizer is None:
+            optimizer = 'adam'
+
+        if lr_multipliers is None:
+            lr_multipliers = {}
+
+        grads_and_vars = [(grad, var) for grad, var in
+                          zip(tf.gradients(loss, var_list), var_list)
+                          if grad is not None]
+        if len(grads_and_vars) == 0:
+            raise ValueError("No gradients for any variable to optimize.")
+
+        if clip_norm is not None:
+            grads, _ = tf.clip_by_global_norm(
+                [grad for grad, _ in grads_and_vars], clip_norm)
+            grads_and_vars = [(grad, var) for grad, (_, var) in
+                              zip(grads, grads_and_vars)]
+
+        if not isinstance(optimizer, six.string_types):
+            # Scale the gradients of an optimizer passed in as an
+            # instance, as its learning rate is fixed.
+            multipliers = [_lr_multiplier(var, lr_multipliers)
+                           for _, var in grads_and_vars]
+            grads_and_vars = [(grad * multiplier, var)
+                              if multiplier != 1.0 else (grad, var)
+                              for (grad, var), multiplier in
+                              zip(grads_and_vars, multipliers)]
+            return optimizer.apply_gradients(grads_and_vars,
+                                             global_step=global_step)
+
+        if optimizer.lower() not in _OPTIMIZERS:
+            raise ValueError("Unknown optimizer: {}.".format(optimizer))
+
+        if learning_rate is None:
+            # Use a decaying scale factor.
+            learning_rate = tf.train.exponential_decay(0.1, global_step,
+                                                       100, 0.9,
+                                                       staircase=True)
+        elif callable(learning_rate):
+            learning_rate = learning_rate(global_step)
+
+        groups = {}
+        for grad, var in grads_and_vars:
+            groups.setdefault(_lr_multiplier(var, lr_multipliers),
+                              []).append((grad, var))
+
+        train = []
+        for multiplier, group in sorted(groups.items(), key=lambda x: x[0]):
+            step_size = learning_rate if multiplier == 1.0 else \
+                learning_rate * multiplier
+            # Only one of the optimizers increments the counter.
+            group_optimizer = _OPTIMIZERS[optimizer.lower()](step_size)
+            train += [group_optimizer.apply_gradients(
+                group, global_step=global_step if len(train) == 0 else None)]
+
+        if len(train) == 1:
+            return train[0]
+        else:
+            return tf.group(*train)
+
+    def _build_convergence(self, tol, tol_params, smoothing):
+        """Build the convergence check, which runs in the same session
+        run as each training step and after it.
 
-        init = tf.initialize_all_variables()
-        init.run()
+        Set ``self._convergence_check`` to an operation which updates
+        the diagnostics and returns the number of consecutive
+        iterations that have converged.
+        """
+        def variable(value):
+            # Diagnostics are reset at each initialization, and are not
+            # part of checkpoints.
+            return tf.Variable(value, trainable=False, collections=[])
+
+        ema = variable(0.0)
+        count = variable(0.0)
+        n_converged = variable(0)
+        self._convergence_variables = [ema, count, n_converged]
+        # Bias-corrected exponential moving averages of the loss,
+        # before and after this iteration.
+        ema_new = smoothing * ema + (1.0 - smoothing) * self.loss
+        count_new = count + 1.0
+        loss_old = ema / (1.0 - tf.pow(smoothing, count))
+        loss_new = ema_new / (1.0 - tf.pow(smoothing, count_new))
+        assignments = [(ema, ema_new), (count, count_new)]
+        converged = []
+        if tol is not None:
+            change = tf.abs(loss_new - loss_old) / \
+                tf.maximum(tf.abs(loss_old), 1e-8)
+            converged += [tf.logical_and(count > 0.0, change < tol)]
+
+        if tol_params is not None:
+            params = self.var_list
+            # Read the parameters after the training step, through
+            # their references; the variables' snapshots are read
+            # before the step, by the loss.
+            with tf.control_dependencies([self.train]):
+                values = [tf.identity(var.ref()) for var in params]
+
+            params_old = [variable(tf.zeros(var.get_shape(),
+                                            dtype=var.dtype.base_dtype))
+                          for var in params]
+            self._convergence_variables += params_old
+            change = tf.sqrt(tf.add_n([tf.constant(0.0)] + [
+                tf.reduce_sum(tf.square(value - value_old))
+                for value, value_old in zip(values, params_old)]))
+            converged += [tf.logical_and(count > 0.0, change < tol_params)]
+            assignments += list(zip(params_old, values))
+
+        converged = tf.reduce_all(tf.pack(converged))
+        n_converged_new = tf.select(converged, n_converged + 1,
+                                    tf.zeros_like(n_converged))
+        assignments += [(n_converged, n_converged_new)]
+        # Assign only after every diagnostic has read the old values.
+        with tf.control_dependencies([n_converged_new]):
+            updates = [var.assign(value) for var, value in assignments]
+
+        with tf.control_dependencies(updates):
+            self._convergence_check = tf.identity(n_converged_new)
+
+    def _build_checkpoint(self):
+        """Build the operations to save and restore checkpoints.
+
+        Saving runs in a background thread while training continues.
+        To save a consistent state, the variables are first copied to
+        shadow variables in a single session run, and the shadow
+        variables are saved under the names of the originals.
+        """
+        variables = self.variables + self.optimizer_variables
+        shadows = [tf.Variable(tf.zeros(var.get_shape(),
+                                        dtype=var.dtype.base_dtype),
+                               trainable=False, collections=[])
+                   for var in variables]
+        get_session().run([shadow.initializer for shadow in shadows])
+        self._snapshot = tf.group(*[shadow.assign(var) for shadow, var
+                                    in zip(shadows, variables)])
+        self._saver = tf.train.Saver(
+            {var.op.name: shadow for var, shadow in zip(variables, shadows)})
+        self._restorer = tf.train.Saver(
+            {var.op.name: var for var in variables})
+
+    def _graph_config(self):
+        """Settings passed into ``initialize`` that the loss function's
+        graph depends on. If they change, the graph is rebuilt.
+
+        Any class based on ``VariationalInference`` whose
+        ``build_loss`` depends on such settings **must** extend this
+        method.
 
-        # Start input enqueue threads.
-        self.coord = tf.train.Coordinator()
-        self.threads = tf.train.start_queue_runners(coord=self.coord)
+        Returns
+        -------
+        tuple
+        """
+        return ()
 
     def update(self):
         """Run one iteration of optimizer for variational inference.
@@ -237,8 +697,21 @@ class VariationalInference(Inference):
             Loss function values after one iteration.
         """
         sess = get_session()
-        _, loss = sess.run([self.train, self.loss])
-        return loss
+        # Fetch the convergence check and the summaries for records in
+        # the same session run.
+        fetches = [self.train, self.loss]
+        if self._check is not None:
+            fetches += [self._check]
+
+        if len(self.sinks) > 0:
+            fetches += [tensor for _, tensor in self._summaries]
+
+        values = sess.run(fetches)
+        if self._check is not None:
+            self.n_converged = int(values.pop(2))
+
+        self._summary_values = values[2:]
+        return values[1]
 
     def print_progress(self, t, loss):
         """Print progress to output.
@@ -253,7 +726,66 @@ class VariationalInference(Inference):
         if self.n_print is not None:
             if t % self.n_print == 0:
                 print("iter {:d} loss {:.2f}".format(t, loss))
-                print(self.variational)
+
+    def record(self, t, loss):
+        """Write a record of progress to the sinks passed into
+        ``initialize``, every ``self.n_record`` iterations.
+
+        Parameters
+        ----------
+        t : int
+            Iteration counter.
+        loss : double
+            Loss function value at iteration ``t``.
+        """
+        if len(self.sinks) == 0 or self.n_record is None or \
+                t % self.n_record != 0:
+            return
+
+        now = time.time()
+        step_time = (now - self._record_time) / max(t - self._record_t, 1)
+        self._record_t = t
+        self._record_time = now
+        record = {'step': t, 'loss': float(loss), 'step_time': step_time}
+        if self._batch_size is not None:
+            record['examples_per_sec'] = self._batch_size / step_time
+
+        for (key, _), value in zip(self._summaries, self._summary_values):
+            record[key] = float(value)
+
+        for sink in self.sinks:
+            sink.write(record)
+
+    def checkpoint(self, t):
+        """Save a checkpoint in the background, every
+        ``self.n_checkpoint`` iterations, if ``checkpoint_dir`` was
+        passed into ``initialize``.
+
+        Parameters
+        ----------
+        t : int
+            Iteration counter.
+        """
+        if self.checkpoint_dir is None or self.n_checkpoint is None:
+            return
+
+        if (t + 1) % self.n_checkpoint == 0 or t == self.n_iter:
+            # The previous save must finish before its shadow
+            # variables are overwritten.
+            self._wait_checkpoint()
+            sess = get_session()
+            sess.run(self._snapshot)
+            path = os.path.join(self.checkpoint_dir, 'model.ckpt')
+            self._checkpoint_thread = threading.Thread(
+                target=self._saver.save, args=(sess, path),
+                kwargs={'global_step': t + 1})
+            self._checkpoint_thread.start()
+
+    def _wait_checkpoint(self):
+        thread = getattr(self, '_checkpoint_thread', None)
+        if thread is not None:
+            thread.join()
+            self._checkpoint_thread = None
 
     def finalize(self):
         """Function to call after convergence.
@@ -261,9 +793,15 @@ class VariationalInference(Inference):
         Any class based on ``VariationalInference`` **may**
         overwrite this method.
         """
-        # Ask threads to stop.
-        self.coord.request_stop()
-        self.coord.join(self.threads)
+        # Wait for any checkpoint and records to be saved. The input
+        # threads keep running, as stopping them closes their queues;
+        # this lets a later ``initialize`` reuse the graph, e.g., with
+        # ``n_minibatch``. They are stopped if the graph is rebuilt.
+        # The sinks are not closed, so that the caller can pass them to
+        # a later ``initialize``.
+        self._wait_checkpoint()
+        for sink in self.sinks:
+            sink.flush()
 
     def build_loss(self):
         """Build loss function.
@@ -311,6 +849,11 @@ class MFVI(VariationalInference):
             Whether to force inference to use the score function
             gradient estimator. Otherwise default is to use the
             reparameterization gradient if available.
+        analytic_entropy : bool, optional
+            Whether to compute the entropy of the variational model
+            analytically rather than estimate it by Monte Carlo. This
+            applies only if every layer implements ``entropy``, and
+            the KL divergence to the prior is not analytic.
         """
         if score is None and self.variational.is_reparameterized and \
                              self.variational.is_differentiable:
@@ -319,8 +862,12 @@ class MFVI(VariationalInference):
             self.score = True
 
         self.n_samples = n_samples
+        self.analytic_entropy = kwargs.pop('analytic_entropy', False)
         return super(MFVI, self).initialize(*args, **kwargs)
 
+    def _graph_config(self):
+        return (self.n_samples, self.score, self.analytic_entropy)
+
     def build_loss(self):
         """Wrapper for the MFVI loss function.
 
@@ -335,18 +882,30 @@ class MFVI(VariationalInference):
 
         of the loss function.
 
-        If the variational model is a Gaussian distribution, then part of the
-        loss function can be computed analytically.
-
-        If the variational model is a normal distribution and the prior is
-        standard normal, then part of the loss function can be computed
-        analytically following Kingma and Welling (2014),
+        If the model has a ``log_lik`` method and the KL divergence from
+        the variational model to the prior is analytic, then part of
+        the loss function can be computed analytically following
+        Kingma and Welling (2014),
 
         .. math::
 
             E[\log p(x | z) + KL],
 
-        where the KL term is computed analytically.
+        where the KL term is computed analytically. The prior is given
+        by the model's ``prior`` attribute, a ``Variational`` whose
+        layers pair with those of the variational model; the KL is
+        analytic if one is registered (see ``register_kl``) for every
+        pair of layers. If the model has no ``prior`` attribute, the
+        prior is assumed to be standard normal, and the KL is analytic
+        if the variational model is normal.
+
+        Otherwise, if ``analytic_entropy`` was passed into
+        ``initialize``, the entropy of the variational model is
+        computed analytically,
+
+        .. math::
+
+            E[\log p(x, z)] + H(q(z; \lambda)).
 
         Returns
         -------
@@ -354,22 +913,53 @@ class MFVI(VariationalInference):
             an appropriately selected loss function form
         """
         if self.score:
-            if self.variational.is_normal and hasattr(self.model, 'log_lik'):
+            if self._is_kl_analytic():
                 return self.build_score_loss_kl()
-            # Analytic entropies may lead to problems around
-            # convergence; for now it is deactivated.
-            #elif self.variational.is_entropy:
-            #    return self.build_score_loss_entropy()
+            elif self.analytic_entropy and self.variational.is_entropy:
+                return self.build_score_loss_entropy()
             else:
                 return self.build_score_loss()
         else:
-            if self.variational.is_normal and hasattr(self.model, 'log_lik'):
+            if self._is_kl_analytic():
                 return self.build_reparam_loss_kl()
-            #elif self.variational.is_entropy:
-            #    return self.build_reparam_loss_entropy()
+            elif self.analytic_entropy and self.variational.is_entropy:
+                return self.build_reparam_loss_entropy()
             else:
                 return self.build_reparam_loss()
 
+    def _is_kl_analytic(self):
+        """Whether the KL term of the loss can be computed
+        analytically; see ``build_loss``."""
+        if not hasattr(self.model, 'log_lik'):
+            return False
+
+        prior = getattr(self.model, 'prior', None)
+        if prior is None:
+            return self.variational.is_normal
+
+        return len(prior.layers) == len(self.variational.layers) and \
+            all([has_kl(q, p) for q, p in
+                 zip(self.variational.layers, prior.layers)])
+
+    def build_kl(self):
+        """Build the analytic KL divergence from the variational model
+        to the prior,
+
+        .. math::
+
+            KL(q(z; \lambda) || p(z)),
+
+        summed over the layers of the variational model.
+        """
+        prior = getattr(self.model, 'prior', None)
+        if prior is None:
+            mu = tf.concat(0, [layer.loc for layer in self.variational.layers])
+            sigma = tf.concat(0, [layer.scale for layer in self.variational.layers])
+            return kl_multivariate_normal(mu, sigma)
+
+        return tf.add_n([kl_divergence(q, p) for q, p in
+                         zip(self.variational.layers, prior.layers)])
+
     def build_score_loss(self):
         """Build loss function. Its automatic differentiation
         is a stochastic gradient of
@@ -422,9 +1012,7 @@ class MFVI(VariationalInference):
 
         based on the score function estimator. (Paisley et al., 2012)
 
-        It assumes the KL is analytic.
-
-        It assumes the prior is :math:`p(z) = \mathcal{N}(z; 0, 1)`.
+        It assumes the KL is analytic; see ``build_kl``.
 
         Computed by sampling from :math:`q(z;\lambda)` and evaluating the
         expectation using Monte Carlo sampling.
@@ -434,9 +1022,7 @@ class MFVI(VariationalInference):
 
         q_log_prob = self.variational.log_prob(stop_gradient(z))
         p_log_lik = self.model.log_lik(x, z)
-        mu = tf.concat(0, [layer.loc for layer in self.variational.layers])
-        sigma = tf.concat(0, [layer.scale for layer in self.variational.layers])
-        kl = kl_multivariate_normal(mu, sigma)
+        kl = self.build_kl()
         self.loss = tf.reduce_mean(p_log_lik) - kl
         return -(tf.reduce_mean(q_log_prob * stop_gradient(p_log_lik)) - kl)
 
@@ -477,9 +1063,7 @@ class MFVI(VariationalInference):
 
         based on the reparameterization trick. (Kingma and Welling, 2014)
 
-        It assumes the KL is analytic.
-
-        It assumes the prior is :math:`p(z) = \mathcal{N}(z; 0, 1)`
+        It assumes the KL is analytic; see ``build_kl``.
 
         Computed by sampling from :math:`q(z;\lambda)` and evaluating the
         expectation using Monte Carlo sampling.
@@ -487,10 +1071,8 @@ class MFVI(VariationalInference):
         x = self.data
         z = self.variational.sample(self.n_samples)
 
-        mu = tf.concat(0, [layer.loc for layer in self.variational.layers])
-        sigma = tf.concat(0, [layer.scale for layer in self.variational.layers])
         self.loss = tf.reduce_mean(self.model.log_lik(x, z)) - \
-                    kl_multivariate_normal(mu, sigma)
+                    self.build_kl()
         return -self.loss
 
     def build_reparam_loss_entropy(self):
@@ -539,6 +1121,9 @@ class KLpq(VariationalInference):
         self.n_samples = n_samples
         return super(KLpq, self).initialize(*args, **kwargs)
 
+    def _graph_config(self):
+        return (self.n_samples, )
+
     def build_loss(self):
         """Build loss function. Its automatic differentiation
         is a stochastic gradient of
@@ -594,16 +1179,55 @@ class MAP(VariationalInference):
     .. math::
 
         \min_{z} - \log p(x,z)
+
+    By default the problem is solved with a stochastic first-order
+    optimizer, as in other variational inference. For deterministic,
+    full-batch objectives, it can instead be solved with L-BFGS or a
+    trust-region Newton method; see ``initialize``.
+
+    The parameters are passed into the model directly, as a batch of
+    one set of latent variables, rather than sampled from a
+    ``PointMass`` distribution. The ``PointMass`` layers in
+    ``self.variational`` only hold them, e.g., for printing and
+    saving.
     """
     def __init__(self, model, data=None, params=None):
+        """Initialization.
+
+        Parameters
+        ----------
+        model : ed.Model
+            probability model
+        data : dict, optional
+            Data dictionary; see ``Inference``.
+        params : tf.Tensor, list of tf.Tensor or dict, optional
+            Parameters to optimize: a vector, or a list or dictionary
+            of tensors for a model whose ``log_prob`` takes a list or
+            dictionary of latent variables. Default is a vector of
+            size ``model.n_vars`` initialized from a standard normal,
+            or no parameters if the model's ``n_vars`` is missing or
+            None.
+        """
         with tf.variable_scope("variational"):
-            if hasattr(model, 'n_vars'):
-                variational = Variational()
-                variational.add(PointMass(model.n_vars, params))
+            if params is None:
+                if getattr(model, 'n_vars', None) is not None:
+                    params = tf.Variable(tf.random_normal([model.n_vars]),
+                                         name='params')
+                else:
+                    params = tf.zeros([0])
+
+            if isinstance(params, dict):
+                param_list = [params[key] for key in sorted(params)]
+            elif isinstance(params, list):
+                param_list = params
             else:
-                variational = Variational()
-                variational.add(PointMass(0))
+                param_list = [params]
 
+            variational = Variational()
+            for param in param_list:
+                variational.add(PointMass(get_dims(param), param))
+
+        self.params = params
         super(MAP, self).__init__(model, variational, data)
 
     def build_loss(self):
@@ -614,10 +1238,176 @@ class MAP(VariationalInference):
             - \log p(x,z)
         """
         x = self.data
-        z = self.variational.sample()
+        z = self._latent_variables()
         self.loss = tf.squeeze(self.model.log_prob(x, z))
         return -self.loss
 
+    def _latent_variables(self):
+        """The parameters as a batch of one set of latent variables."""
+        if isinstance(self.params, dict):
+            return {key: tf.expand_dims(param, 0)
+                    for key, param in six.iteritems(self.params)}
+        elif isinstance(self.params, list):
+            return [tf.expand_dims(param, 0) for param in self.params]
+        else:
+            return tf.expand_dims(self.params, 0)
+
+    def initialize(self, *args, **kwargs):
+        """Initialize inference.
+
+        Parameters
+        ----------
+        method : str, optional
+            Optimization method. Default is the first-order optimizer
+            set by ``optimizer``. 'lbfgs' uses L-BFGS with a line
+            search, and 'newton' uses the trust-region Newton conjugate
+            gradient method with Hessian-vector products, both from
+            ``scipy.optimize``. They require a deterministic objective
+            over the full data, so no data subsampling, and take at
+            most ``n_iter`` iterations.
+        *args
+            Passed into ``VariationalInference.initialize``.
+        **kwargs
+            Passed into ``VariationalInference.initialize``.
+        """
+        method = kwargs.pop('method', None)
+        if method not in (None, 'lbfgs', 'newton'):
+            raise ValueError("Unknown method: {}.".format(method))
+
+        self.method = method
+        super(MAP, self).initialize(*args, **kwargs)
+        if method is not None and self.n_minibatch is not None:
+            raise ValueError("The {} method requires the full data at "
+                             "each iteration.".format(method))
+
+        if method is not None and \
+                getattr(self, '_second_order_config', None) != self._config:
+            self._build_second_order()
+            self._second_order_config = self._config
+
+    def run(self, *args, **kwargs):
+        """Run inference; see ``VariationalInference.run``. With a
+        second-order ``method``, the whole optimization is a single
+        call to ``update``.
+        """
+        method = kwargs.pop('method', None)
+        if method is None:
+            return super(MAP, self).run(*args, **kwargs)
+
+        self.initialize(*args, method=method, **kwargs)
+        self.update()
+        self.finalize()
+
+    def update(self):
+        """Run iterations of the optimizer.
+
+        With a second-order ``method``, run ``scipy.optimize.minimize``
+        from the current parameters for the iterations remaining up to
+        ``self.n_iter``, with progress printed, recorded and
+        checkpointed at each iteration. Curvature information is not
+        kept between calls.
+
+        Returns
+        -------
+        loss : double
+            Loss function value at the last iteration.
+        """
+        if self.method is None:
+            return super(MAP, self).update()
+
+        sess = get_session()
+        fetches = [self.loss, self._objective, self._grads]
+        if len(self.sinks) > 0:
+            fetches += [tensor for _, tensor in self._summaries]
+
+        # Cache the latest evaluation, which scipy's callback reuses.
+        cache = {}
+
+        def assign(x):
+            if cache.get('x') is None or not np.array_equal(cache['x'], x):
+                sess.run(self._assign_params, dict(
+                    zip(self._params_ph, self._unflatten(x))))
+                cache['x'] = np.array(x)
+                cache['values'] = None
+
+        def fun(x):
+            assign(x)
+            if cache['values'] is None:
+                cache['values'] = sess.run(fetches)
+
+            return float(cache['values'][1]), \
+                self._flatten(cache['values'][2])
+
+        def hessp(x, p):
+            assign(x)
+            feed_dict = dict(zip(self._vector_ph, self._unflatten(p)))
+            return self._flatten(sess.run(self._hessp, feed_dict))
+
+        t = [int(sess.run(self.global_step))]
+        maxiter = max(self.n_iter + 1 - t[0], 0)
+
+        def callback(x):
+            fun(x)
+            sess.run(self._advance)
+            loss = cache['values'][0]
+            self._summary_values = cache['values'][3:]
+            self.print_progress(t[0], loss)
+            self.record(t[0], loss)
+            self.checkpoint(t[0])
+            t[0] += 1
+
+        x0 = self._flatten(sess.run(self.var_list))
+        if self.method == 'lbfgs':
+            result = optimize.minimize(fun, x0, method='L-BFGS-B', jac=True,
+                                       callback=callback,
+                                       options={'maxiter': maxiter})
+        else:
+            result = optimize.minimize(fun, x0, method='trust-ncg', jac=True,
+                                       hessp=hessp, callback=callback,
+                                       options={'maxiter': maxiter})
+
+        fun(result.x)
+        return cache['values'][0]
+
+    def _build_second_order(self):
+        """Build the operations to evaluate the objective's gradient
+        and Hessian-vector products, and to assign the parameters, for
+        the optimizers in ``scipy.optimize``."""
+        if len(self.var_list) == 0:
+            raise ValueError("There are no variables to optimize.")
+
+        grads = tf.gradients(self._objective, self.var_list)
+        self._grads = [tf.zeros_like(var) if grad is None else grad
+                       for grad, var in zip(grads, self.var_list)]
+        self._vector_ph = [tf.placeholder(tf.float32, var.get_shape())
+                           for var in self.var_list]
+        grad_vector = tf.add_n([tf.reduce_sum(grad * vector) for grad, vector
+                                in zip(self._grads, self._vector_ph)])
+        hessp = tf.gradients(grad_vector, self.var_list)
+        self._hessp = [tf.zeros_like(var) if hv is None else hv
+                       for hv, var in zip(hessp, self.var_list)]
+        self._params_ph = [tf.placeholder(tf.float32, var.get_shape())
+                           for var in self.var_list]
+        self._assign_params = tf.group(*[
+            var.assign(ph) for var, ph in zip(self.var_list, self._params_ph)])
+        self._advance = tf.assign_add(self.global_step, 1)
+        self._shapes = [tuple(get_dims(var)) for var in self.var_list]
+
+    def _flatten(self, values):
+        return np.concatenate([np.reshape(value, [-1]) for value in values]) \
+            .astype(np.float64)
+
+    def _unflatten(self, x):
+        values = []
+        start = 0
+        for shape in self._shapes:
+            size = int(np.prod(shape))
+            values += [np.reshape(x[start:(start + size)], shape)
+                       .astype(np.float32)]
+            start += size
+
+        return values
+
 
 class Laplace(MAP):
     """Laplace approximation.
@@ -640,10 +1430,35 @@ class Laplace(MAP):
         """
         # use only a batch of data to estimate hessian
         x = self.data
-        z = self.variational.sample()
+        z = self._latent_variables()
         var_list = tf.get_collection(tf.GraphKeys.TRAINABLE_VARIABLES,
                                      scope='variational')
         inv_cov = hessian(self.model.log_prob(x, z), var_list)
         print("Precision matrix:")
         print(inv_cov.eval())
         super(Laplace, self).finalize()
+
+
+def _lr_multiplier(var, lr_multipliers):
+    """Return the learning rate multiplier of ``var``; see
+    ``VariationalInference.initialize``."""
+    for key, multiplier in six.iteritems(lr_multipliers):
+        if isinstance(key, six.string_types):
+            if key in var.op.name:
+                return multiplier
+        elif key is var:
+            return multiplier
+
+    return 1.0
+
+
+_OPTIMIZERS = {
+    'sgd': tf.train.GradientDescentOptimizer,
+    'momentum': lambda learning_rate:
+        tf.train.MomentumOptimizer(learning_rate, 0.9),
+    'adam': tf.train.AdamOptimizer,
+    'adagrad': tf.train.AdagradOptimizer,
+    'adadelta': tf.train.AdadeltaOptimizer,
+    'rmsprop': tf.train.RMSPropOptimizer,
+    'ftrl': tf.train.FtrlOptimizer,
+}
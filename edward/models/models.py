@@ -2,12 +2,24 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import functools
+import hashlib
+import itertools
+import json
+import multiprocessing
 import numpy as np
+import os
 import six
+import tempfile
 import tensorflow as tf
 
 from edward.util import get_dims, get_session
-from edward.models.random_variables import Normal
+from edward.models.random_variables import Normal, RandomVariable
+from multiprocessing.pool import ThreadPool
+from six.moves import cPickle
+
+__all__ = ['PosteriorSamples', 'PyMC3Model', 'PythonModel', 'StanModel',
+           'Variational']
 
 try:
     import pystan
@@ -15,6 +27,13 @@ try:
 except ImportError:
     pass
 
+try:
+    import fcntl
+except ImportError:
+    # File locking is unavailable on non-POSIX platforms; concurrent
+    # processes may then compile the same Stan program more than once.
+    fcntl = None
+
 try:
     import pymc3 as pm
 except ImportError:
@@ -47,10 +66,10 @@ class PyMC3Model(object):
         """
         Parameters
         ----------
-        xs : dict of str to tf.Tensor
+        xs : dict of str to tf.Tensor or np.ndarray
             Data dictionary. Each key is a data structure used in the
             model (Theano shared variable), and its value is the
-            corresponding realization (tf.Tensor).
+            corresponding realization (tf.Tensor or np.ndarray).
         zs : list of tf.Tensor or tf.Tensor
             Latent variables. A list if multiple varational families,
             otherwise a tf.Tensor if single variational family.
@@ -65,25 +84,29 @@ class PyMC3Model(object):
         -----
         It wraps around a Python function. The Python function takes
         inputs of type np.ndarray and outputs a np.ndarray.
+
+        Data values which are NumPy arrays are bound by reference on
+        the Python side. Only tensor values are passed through
+        ``tf.py_func()`` and thus copied at each session run.
         """
-        # Store ``xs.keys()`` so that ``_py_log_prob_args`` knows how each
-        # data value corresponds to a key.
-        self.xs_keys = list(six.iterkeys(xs))
+        xs_keys = _bind_data(xs)
 
         # Pass in all tensors as a flattened list for tf.py_func().
-        inputs = [tf.convert_to_tensor(x) for x in six.itervalues(xs)]
+        inputs = [tf.convert_to_tensor(xs[key]) for key in xs_keys]
         inputs += [zs]
 
-        return tf.py_func(self._py_log_prob_args, inputs, [tf.float32])[0]
+        func = functools.partial(self._py_log_prob_args, xs, xs_keys)
+        return tf.py_func(func, inputs, [tf.float32])[0]
 
-    def _py_log_prob_args(self, *args):
-        xs_values = args[:len(self.xs_keys)]
+    def _py_log_prob_args(self, xs, xs_keys, *args):
+        xs = _unflatten_data(xs, xs_keys, args[:-1])
         zs = args[-1]
 
         # Set data placeholders in PyMC3 model (Theano shared
-        # variable) to their realizations (NumPy array).
-        for key, value in zip(self.xs_keys, xs_values):
-            key.set_value(value)
+        # variable) to their realizations (NumPy array). Borrowing
+        # avoids copying the array.
+        for key, value in six.iteritems(xs):
+            key.set_value(value, borrow=True)
 
         # Calculate model's log density, one for each sample of latent
         # variables.
@@ -95,20 +118,105 @@ class PyMC3Model(object):
         return lp
 
 
+def _bind_data(xs):
+    """Split the data dictionary into values which are passed through
+    ``tf.py_func()`` and NumPy arrays which are bound by reference.
+
+    Return the keys of the former, so that ``_unflatten_data`` knows
+    how each data value corresponds to a key. The caller binds the
+    dictionary and the keys to the Python function of each op; the
+    arrays are looked up when the function is called, so replacing an
+    array in ``xs`` takes effect at the next session run.
+    """
+    return [key for key, value in six.iteritems(xs)
+            if not isinstance(value, np.ndarray)]
+
+
+def _unflatten_data(xs, xs_keys, xs_values):
+    """Form the data dictionary from the values passed through
+    ``tf.py_func()`` and the arrays in ``xs``.
+    """
+    data = {key: value for key, value in six.iteritems(xs)
+            if isinstance(value, np.ndarray)}
+    data.update(zip(xs_keys, xs_values))
+    return data
+
+
 class PythonModel(object):
     """Model wrapper for models written in NumPy/SciPy.
+
+    Attributes
+    ----------
+    n_jobs : int
+        Number of workers across which the samples of latent variables
+        are split when calling ``_py_log_prob``. If -1, use as many
+        workers as CPUs. Default is to evaluate all samples in a
+        single call.
+    backend : str
+        Either 'thread' or 'process'. A thread pool is suitable for
+        NumPy/SciPy code which releases the GIL. A process pool
+        requires the model to be picklable and its class importable:
+        forking a process which runs TensorFlow may deadlock, so
+        workers are started with the 'forkserver' method, or 'spawn'
+        where it is unavailable. Call ``close()`` to terminate the
+        pool.
+    numerical_grad : bool
+        Whether to differentiate ``log_prob`` with respect to the
+        latent variables using central finite differences, if the
+        model does not implement ``_py_grad_log_prob``.
+
+    Notes
+    -----
+    Subclasses implement ``_py_log_prob(xs, zs)``, returning a vector
+    of log densities, one for each row of ``zs``. They may also
+    implement ``_py_grad_log_prob(xs, zs)``, returning an array of the
+    same shape as ``zs`` whose rows are the gradients of the log
+    density with respect to the corresponding rows of ``zs``. If
+    either ``_py_grad_log_prob`` is implemented or ``numerical_grad``
+    is ``True``, then ``log_prob`` is differentiable with respect to
+    ``zs``; this enables reparameterization gradients and ``MAP``.
     """
-    def __init__(self):
+    n_jobs = 1
+    backend = 'thread'
+    numerical_grad = False
+    _pool = None
+    _pool_size = None
+
+    def __init__(self, n_jobs=1, backend='thread', numerical_grad=False):
+        """
+        Parameters
+        ----------
+        n_jobs : int, optional
+            See class attributes.
+        backend : str, optional
+            See class attributes.
+        numerical_grad : bool, optional
+            See class attributes.
+        """
+        if backend not in ('thread', 'process'):
+            raise ValueError("backend must be 'thread' or 'process'.")
+
         self.n_vars = None
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.numerical_grad = numerical_grad
+
+    def __getstate__(self):
+        # Worker pools are not picklable. Worker processes receive the
+        # model once, when the pool starts.
+        state = self.__dict__.copy()
+        state.pop('_pool', None)
+        state.pop('_pool_size', None)
+        return state
 
     def log_prob(self, xs, zs):
         """
         Parameters
         ----------
-        xs : dict of str to tf.Tensor
+        xs : dict of str to tf.Tensor or np.ndarray
             Data dictionary. Each key names a data structure used in
             the model (str), and its value is the corresponding
-            corresponding realization (tf.Tensor).
+            corresponding realization (tf.Tensor or np.ndarray).
         zs : list of tf.Tensor or tf.Tensor
             Latent variables. A list if multiple varational families,
             otherwise a tf.Tensor if single variational family.
@@ -123,29 +231,190 @@ class PythonModel(object):
         -----
         It wraps around a Python function. The Python function takes
         inputs of type np.ndarray and outputs a np.ndarray.
+
+        Data values which are NumPy arrays are bound by reference on
+        the Python side. Only tensor values are passed through
+        ``tf.py_func()`` and thus copied at each session run.
         """
-        # Store ``xs.keys()`` so that ``_py_log_prob_args`` knows how each
-        # data value corresponds to a key.
-        self.xs_keys = list(six.iterkeys(xs))
+        xs_keys = _bind_data(xs)
 
         # Pass in all tensors as a flattened list for tf.py_func().
-        inputs = [tf.convert_to_tensor(x) for x in six.itervalues(xs)]
+        inputs = [tf.convert_to_tensor(xs[key]) for key in xs_keys]
         inputs += [zs]
 
-        return tf.py_func(self._py_log_prob_args, inputs, [tf.float32])[0]
+        func = functools.partial(self._py_log_prob_args, xs, xs_keys)
+        if not hasattr(self, '_py_grad_log_prob') and not self.numerical_grad:
+            return tf.py_func(func, inputs, [tf.float32])[0]
 
-    def _py_log_prob_args(self, *args):
-        # Convert from flattened list to dictionaries for use in a
-        # Python function which works with Numpy arrays.
-        xs_values = args[:len(self.xs_keys)]
-        zs = args[-1]
-        xs = {key: value for key, value in zip(self.xs_keys, xs_values)}
-        return self._py_log_prob(xs, zs)
+        # Override the (non-existent) gradient of tf.py_func().
+        grad_name = self._register_gradient(xs, xs_keys)
+        graph = tf.get_default_graph()
+        with graph.gradient_override_map({'PyFunc': grad_name}):
+            return tf.py_func(func, inputs, [tf.float32])[0]
+
+    def _py_log_prob_args(self, xs, xs_keys, *args):
+        return self._map_samples('_py_log_prob', xs, xs_keys, args[:-1],
+                                 args[-1])
+
+    def _register_gradient(self, xs, xs_keys):
+        """Register ``_log_prob_grad`` as the gradient function of a
+        ``log_prob`` op, bound to the op's data.
+        """
+        grad_name = 'PythonModelGrad' + str(next(_grad_counter))
+
+        def grad_fn(op, grad):
+            return self._log_prob_grad(xs, xs_keys, op, grad)
+
+        tf.RegisterGradient(grad_name)(grad_fn)
+        return grad_name
+
+    def _log_prob_grad(self, xs, xs_keys, op, grad):
+        """Gradient of the ``tf.py_func()`` in ``log_prob``. The data
+        inputs receive no gradient.
+        """
+        zs = op.inputs[-1]
+        func = functools.partial(self._py_grad_log_prob_args, xs, xs_keys)
+        grad_zs = tf.py_func(func, list(op.inputs), [tf.float32])[0]
+        grad_zs.set_shape(zs.get_shape())
+        grad_zs = tf.expand_dims(grad, 1) * grad_zs
+        return [None] * (len(op.inputs) - 1) + [tf.cast(grad_zs, zs.dtype)]
+
+    def _py_grad_log_prob_args(self, xs, xs_keys, *args):
+        if hasattr(self, '_py_grad_log_prob'):
+            method = '_py_grad_log_prob'
+        else:
+            method = '_py_numerical_grad_log_prob'
+
+        return np.asarray(self._map_samples(method, xs, xs_keys, args[:-1],
+                                            args[-1]),
+                          dtype=np.float32)
+
+    def _py_numerical_grad_log_prob(self, xs, zs):
+        """Central finite differences of ``_py_log_prob`` with respect
+        to ``zs``.
+
+        All perturbed copies of ``zs`` are stacked into a single batch
+        so that ``_py_log_prob`` is called once.
+        """
+        zs = np.asarray(zs, dtype=np.float64)
+        n_samples, d = zs.shape
+        h = 1e-3 * np.maximum(1.0, np.abs(zs))
+        # perturb[j, s, :] perturbs the jth latent variable of sample s.
+        perturb = np.eye(d)[:, np.newaxis, :] * h[np.newaxis, :, :]
+        zs_plus = (zs + perturb).reshape((d * n_samples, d))
+        zs_minus = (zs - perturb).reshape((d * n_samples, d))
+        lp = self._py_log_prob(xs, np.concatenate([zs_plus, zs_minus]))
+        lp_plus, lp_minus = np.split(np.asarray(lp, dtype=np.float64), 2)
+        diff = (lp_plus - lp_minus).reshape((d, n_samples)).T
+        return diff / (2.0 * h)
+
+    def _map_samples(self, method, xs, xs_keys, xs_values, zs):
+        """Call ``method`` on the data and ``zs``, splitting ``zs``
+        along its sample dimension across a pool of ``n_jobs`` workers,
+        and concatenate the results along the same dimension.
+
+        The data is formed from the arrays bound in ``xs`` and the
+        values ``xs_values`` passed through ``tf.py_func()`` for the
+        keys ``xs_keys``. Worker processes receive the model once, when
+        the pool starts, and the data with each chunk of samples, so
+        that one pool serves ``log_prob`` ops on different data.
+        """
+        n_jobs = self.n_jobs
+        if n_jobs == -1:
+            n_jobs = multiprocessing.cpu_count()
+
+        n_jobs = min(n_jobs, zs.shape[0])
+        data = _unflatten_data(xs, xs_keys, xs_values)
+        if n_jobs <= 1:
+            return getattr(self, method)(data, zs)
+
+        pool = self._get_pool(n_jobs)
+        zs_chunks = np.array_split(zs, n_jobs)
+        if self.backend == 'thread':
+            chunks = [(self, method, data, zs_chunk) for zs_chunk in zs_chunks]
+            out = pool.map(_call_method, chunks)
+        else:
+            chunks = [(method, data, zs_chunk) for zs_chunk in zs_chunks]
+            out = pool.map(_call_worker_method, chunks)
+
+        return np.concatenate(out).astype(np.float32)
+
+    def _get_pool(self, n_jobs):
+        """Return a pool of ``n_jobs`` workers, replacing the current
+        pool if its number of workers differs. A process pool is
+        started with the model.
+        """
+        if self._pool is not None:
+            if self._pool_size == n_jobs:
+                return self._pool
+
+            self.close()
+
+        if self.backend == 'thread':
+            self._pool = ThreadPool(n_jobs)
+        else:
+            self._pool = _process_context().Pool(
+                n_jobs, initializer=_init_worker, initargs=(self, ))
+
+        self._pool_size = n_jobs
+        return self._pool
+
+    def close(self):
+        """Terminate the pool of workers, if any."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_size = None
+
+    def __del__(self):
+        self.close()
 
     def _py_log_prob(self, xs, zs):
         raise NotImplementedError()
 
 
+_grad_counter = itertools.count()
+
+
+def _call_method(args):
+    """Evaluate ``model.method(xs, zs)`` for ``args = (model, method,
+    xs, zs)`` in a worker thread.
+    """
+    model, method, xs, zs = args
+    return getattr(model, method)(xs, zs)
+
+
+def _process_context():
+    """Return a multiprocessing context whose workers do not inherit
+    TensorFlow's threads, which are not fork-safe.
+    """
+    if not hasattr(multiprocessing, 'get_context'):
+        return multiprocessing
+
+    try:
+        return multiprocessing.get_context('forkserver')
+    except ValueError:
+        return multiprocessing.get_context('spawn')
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    """Store the model in a worker process."""
+    global _worker_model
+    _worker_model = model
+
+
+def _call_worker_method(args):
+    """Evaluate ``method`` of the worker's model for ``args = (method,
+    xs, zs)``.
+    """
+    method, xs, zs = args
+    return getattr(_worker_model, method)(xs, zs)
+
+
 class StanModel(object):
     """Model wrapper for models written in Stan.
     """
@@ -163,10 +432,26 @@ class StanModel(object):
         *args
             Passed into pystan.StanModel.
         **kwargs
-            Passed into pystan.StanModel.
+            Passed into pystan.StanModel. The keyword argument
+            ``cache_dir`` (str) is not passed and instead names a
+            directory for caching compiled models on disk; see Notes.
+
+        Notes
+        -----
+        If ``cache_dir`` is specified, the compiled model is pickled
+        into ``cache_dir`` under a key given by the Stan program text,
+        the remaining compiler options, and the PyStan version. Later
+        instantiations with the same key load the pickled model
+        instead of recompiling it. A lock file serializes compilation
+        so that concurrent processes sharing ``cache_dir`` compile each
+        program only once.
         """
+        cache_dir = kwargs.pop('cache_dir', None)
         if model is None:
-            self.model = pystan.StanModel(*args, **kwargs)
+            if cache_dir is None:
+                self.model = pystan.StanModel(*args, **kwargs)
+            else:
+                self.model = _cached_stan_model(cache_dir, *args, **kwargs)
         else:
             self.model = model
 
@@ -245,6 +530,77 @@ class StanModel(object):
         return lp
 
 
+def _stan_cache_key(*args, **kwargs):
+    """Hash the Stan program text together with the compiler options."""
+    kwargs = dict(kwargs)
+    if len(args) > 0:
+        # pystan.StanModel's first positional argument is ``file``.
+        kwargs['file'] = args[0]
+        args = args[1:]
+
+    # Key on the program text rather than on the file name.
+    model_code = kwargs.pop('model_code', None)
+    file = kwargs.pop('file', None)
+    if isinstance(file, six.string_types):
+        with open(file) as f:
+            model_code = f.read()
+    elif file is not None:
+        # File-like object; rewind it so PyStan can read it again.
+        model_code = file.read()
+        file.seek(0)
+
+    kwargs.pop('verbose', None)
+    options = repr(args) + repr(sorted(kwargs.items()))
+    key = hashlib.sha1()
+    key.update(pystan.__version__.encode('utf-8'))
+    key.update(str(model_code).encode('utf-8'))
+    key.update(options.encode('utf-8'))
+    return key.hexdigest()
+
+
+def _cached_stan_model(cache_dir, *args, **kwargs):
+    """Load a compiled Stan model from ``cache_dir``, compiling and
+    caching it if it is not already there.
+    """
+    if not os.path.exists(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            # Another process may have created it in the meantime.
+            if not os.path.isdir(cache_dir):
+                raise
+
+    key = _stan_cache_key(*args, **kwargs)
+    path = os.path.join(cache_dir, 'stan-' + key + '.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return cPickle.load(f)
+
+    with open(path + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        try:
+            # Check again as another process may have compiled the
+            # model while we were waiting for the lock.
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return cPickle.load(f)
+
+            model = pystan.StanModel(*args, **kwargs)
+            # Write to a temporary file first so that readers never
+            # see a partially written pickle.
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                cPickle.dump(model, f, protocol=cPickle.HIGHEST_PROTOCOL)
+
+            os.rename(tmp_path, path)
+            return model
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
 class Variational(object):
     """A container for collecting distribution objects."""
     def __init__(self, layers=None):
@@ -363,3 +719,372 @@ class Variational(object):
             out += layer.entropy()
 
         return out
+
+    def save(self, path):
+        """
+        Save the parameters of each layer to a directory, as a
+        ``.npy`` file for each parameter, with the class and shape of
+        each layer in ``variational.json``. The graph is not saved.
+
+        Parameters
+        ----------
+        path : str
+            Directory to save to. It is created if it does not exist.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        tensors = [getattr(layer, name) for layer in self.layers
+                   for name in layer.param_names]
+        values = iter(get_session().run(tensors)) if tensors else iter([])
+        layers = []
+        for l, layer in enumerate(self.layers):
+            params = {}
+            for name in layer.param_names:
+                filename = 'layer_{}_{}.npy'.format(l, name)
+                np.save(os.path.join(path, filename), next(values))
+                params[name] = filename
+
+            layers += [{'class': layer.__class__.__name__,
+                        'shape': [int(dim) for dim in layer.shape],
+                        'params': params}]
+
+        with open(os.path.join(path, 'variational.json'), 'w') as f:
+            json.dump({'layers': layers}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a variational model saved with ``save()``. Each layer is
+        rebuilt with its saved parameters fixed, so neither the
+        training graph nor the probability model is needed.
+
+        The parameters are held in non-trainable variables whose
+        initializers are fed the saved arrays once, which avoids
+        embedding them as constants in the graph definition. They are
+        not in any collection, so ``tf.initialize_all_variables()``
+        leaves them as loaded.
+
+        Parameters
+        ----------
+        path : str
+            Directory to load from.
+        mmap : bool, optional
+            Whether to memory-map the parameter files, rather than
+            read them into memory before they are fed.
+
+        Returns
+        -------
+        Variational
+
+        Raises
+        ------
+        ValueError
+            If a layer's class is not a known ``RandomVariable``.
+        """
+        with open(os.path.join(path, 'variational.json')) as f:
+            metadata = json.load(f)
+
+        layer_classes = _layer_classes(RandomVariable)
+        mmap_mode = 'r' if mmap else None
+        sess = get_session()
+        variational = cls()
+        for layer in metadata['layers']:
+            if layer['class'] not in layer_classes:
+                raise ValueError("Unknown layer class: {}.".format(
+                    layer['class']))
+
+            params = {}
+            for name, filename in six.iteritems(layer['params']):
+                value = np.load(os.path.join(path, filename),
+                                mmap_mode=mmap_mode)
+                placeholder = tf.placeholder(tf.as_dtype(value.dtype),
+                                             value.shape)
+                var = tf.Variable(placeholder, trainable=False,
+                                  collections=[], name=name)
+                sess.run(var.initializer, {placeholder: value})
+                params[name] = var.value()
+
+            variational.add(layer_classes[layer['class']](
+                tuple(layer['shape']), **params))
+
+        return variational
+
+
+def _layer_classes(base):
+    """Map names to all subclasses of ``base``, including those defined
+    outside of Edward."""
+    classes = {}
+    for subclass in base.__subclasses__():
+        classes[subclass.__name__] = subclass
+        classes.update(_layer_classes(subclass))
+
+    return classes
+
+
+class PosteriorSamples(object):
+    """A fixed bank of samples of the latent variables.
+
+    Samples are drawn once from a posterior approximation and then
+    used in its place, e.g., by ``ed.evaluate()``, ``ed.ppc()`` and
+    prediction code, so that all criticism shares the same samples and
+    none is spent re-sampling. The samples can be stored in
+    memory-mapped files and reloaded in another process.
+
+    Parameters
+    ----------
+    samples : list of np.ndarray or np.ndarray
+        If more than one layer, a list of arrays of dimension
+        (n_samples x shape), one for each layer. If one layer, an
+        array of (n_samples x shape).
+    """
+    def __init__(self, samples):
+        if not isinstance(samples, list):
+            samples = [samples]
+
+        self.samples = samples
+        self.n_samples = samples[0].shape[0]
+        if any([sample.shape[0] != self.n_samples for sample in samples]):
+            raise ValueError("All layers must have the same number of "
+                             "samples.")
+
+        self._graph = None
+        self._tensors = {}
+
+    def __len__(self):
+        return self.n_samples
+
+    @classmethod
+    def draw(cls, variational, n_samples, path=None, batch_size=None):
+        """
+        Draw samples from a variational model.
+
+        Parameters
+        ----------
+        variational : ed.Variational
+            Distribution to sample from.
+        n_samples : int
+            Number of samples.
+        path : str, optional
+            Directory to store the samples in, as memory-mapped files.
+            Default is to hold them in memory.
+        batch_size : int, optional
+            Number of samples to draw at a time. Default is all
+            ``n_samples`` at once.
+
+        Returns
+        -------
+        PosteriorSamples
+        """
+        sess = get_session()
+        if batch_size is None:
+            batch_size = n_samples
+
+        zs = variational.sample(batch_size)
+        if not isinstance(zs, list):
+            zs = [zs]
+
+        # Nothing is fed, so the sample tensors are fetched directly,
+        # one batch per run.
+        if path is not None and not os.path.exists(path):
+            os.makedirs(path)
+
+        samples = None
+        for start in range(0, n_samples, batch_size):
+            stop = min(start + batch_size, n_samples)
+            values = sess.run(zs)
+            if samples is None:
+                samples = [cls._allocate(path, l, (n_samples, ) +
+                                         value.shape[1:], value.dtype)
+                           for l, value in enumerate(values)]
+
+            for sample, value in zip(samples, values):
+                sample[start:stop] = value[:(stop - start)]
+
+        bank = cls(samples)
+        if path is not None:
+            for sample in samples:
+                sample.flush()
+
+            bank._save_metadata(path)
+
+        return bank
+
+    def sample(self, n=1):
+        """
+        Return the first ``n`` samples as tensors, in the same form as
+        ``Variational.sample()``.
+
+        The bank is stored once per graph, in a non-trainable variable
+        for each layer whose initializer is fed the samples. This
+        avoids embedding them as constants in the graph definition.
+        Repeated calls with the same ``n`` return the same tensors.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of samples.
+
+        Returns
+        -------
+        list of tf.Tensor or tf.Tensor
+            If more than one layer, a list of tf.Tensors of dimension
+            (n x shape), one for each layer. If one layer, a tf.Tensor
+            of (n x shape).
+
+        Raises
+        ------
+        ValueError
+            If more samples are requested than are stored.
+        """
+        if n > self.n_samples:
+            raise ValueError("Requested {} samples, but only {} are "
+                             "stored.".format(n, self.n_samples))
+
+        graph = tf.get_default_graph()
+        if self._graph is not graph:
+            sess = get_session()
+            variables = []
+            for sample in self.samples:
+                placeholder = tf.placeholder(tf.as_dtype(sample.dtype),
+                                             sample.shape)
+                var = tf.Variable(placeholder, trainable=False,
+                                  collections=[])
+                sess.run(var.initializer, {placeholder: sample})
+                variables += [var.value()]
+
+            self._graph = graph
+            self._tensors = {self.n_samples: variables}
+
+        if n not in self._tensors:
+            self._tensors[n] = [var[:n] for var in
+                                self._tensors[self.n_samples]]
+
+        zs = self._tensors[n]
+        if len(zs) == 1:
+            return zs[0]
+        else:
+            return list(zs)
+
+    def values(self, n=None):
+        """
+        Return the first ``n`` samples as NumPy arrays.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of samples. Default is all samples.
+
+        Returns
+        -------
+        list of np.ndarray or np.ndarray
+            If more than one layer, a list of arrays of dimension
+            (n x shape), one for each layer. If one layer, an array of
+            (n x shape).
+        """
+        if n is None:
+            n = self.n_samples
+        elif n > self.n_samples:
+            raise ValueError("Requested {} samples, but only {} are "
+                             "stored.".format(n, self.n_samples))
+
+        values = [np.asarray(sample[:n]) for sample in self.samples]
+        if len(values) == 1:
+            values = values[0]
+
+        return values
+
+    def batches(self, batch_size, n=None):
+        """
+        Iterate over the first ``n`` samples, ``batch_size`` at a time.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of samples in each batch; the last batch may be
+            smaller.
+        n : int, optional
+            Number of samples. Default is all samples.
+
+        Returns
+        -------
+        generator
+            Batches of samples, in the same form as ``values()``.
+        """
+        if n is None:
+            n = self.n_samples
+        elif n > self.n_samples:
+            raise ValueError("Requested {} samples, but only {} are "
+                             "stored.".format(n, self.n_samples))
+
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            values = [np.asarray(sample[start:stop])
+                      for sample in self.samples]
+            if len(values) == 1:
+                yield values[0]
+            else:
+                yield values
+
+    def save(self, path):
+        """
+        Save the samples to a directory, as a ``.npy`` file for each
+        layer.
+
+        Parameters
+        ----------
+        path : str
+            Directory to save to. It is created if it does not exist.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        for l, sample in enumerate(self.samples):
+            np.save(os.path.join(path, self._filename(l)), sample)
+
+        self._save_metadata(path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load samples saved with ``save()`` or ``draw()``.
+
+        Parameters
+        ----------
+        path : str
+            Directory to load from.
+        mmap : bool, optional
+            Whether to memory-map the samples rather than read them
+            into memory.
+
+        Returns
+        -------
+        PosteriorSamples
+        """
+        with open(os.path.join(path, 'samples.json')) as f:
+            metadata = json.load(f)
+
+        mmap_mode = 'r' if mmap else None
+        samples = [np.load(os.path.join(path, filename), mmap_mode=mmap_mode)
+                   for filename in metadata['files']]
+        return cls(samples)
+
+    @classmethod
+    def _allocate(cls, path, l, shape, dtype):
+        if path is None:
+            return np.empty(shape, dtype=dtype)
+        else:
+            return np.lib.format.open_memmap(
+                os.path.join(path, cls._filename(l)), mode='w+',
+                dtype=dtype, shape=shape)
+
+    @staticmethod
+    def _filename(l):
+        return 'layer_{}.npy'.format(l)
+
+    def _save_metadata(self, path):
+        metadata = {'n_samples': self.n_samples,
+                    'files': [self._filename(l)
+                              for l in range(len(self.samples))]}
+        with open(os.path.join(path, 'samples.json'), 'w') as f:
+            json.dump(metadata, f)
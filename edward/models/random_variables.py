@@ -5,10 +5,15 @@ from __future__ import print_function
 import numpy as np
 import tensorflow as tf
 
-from edward.stats import bernoulli, beta, norm, dirichlet, invgamma, multinomial
+from edward.stats import bernoulli, beta, norm, dirichlet, gamma, invgamma, \
+    multinomial
 from edward.util import cumprod, get_dims, get_session, to_simplex
 from itertools import product
 
+__all__ = ['RandomVariable', 'Bernoulli', 'Beta', 'Dirichlet', 'Gamma',
+           'InvGamma', 'Multinomial', 'Normal', 'PointMass', 'register_kl',
+           'has_kl', 'kl_divergence']
+
 
 class RandomVariable(object):
   """Base class for Edward random variables.
@@ -34,7 +39,12 @@ class RandomVariable(object):
   is_reparameterized : bool
     ``True`` if sampling from ``RandomVariable`` is done by
     reparameterizing random noise drawn from another distribution.
+  param_names : tuple of str
+    Names of the attributes holding its parameters, which are also
+    the keyword arguments to pass them to the constructor.
   """
+  param_names = ()
+
   def __init__(self, shape=1):
     """Initialize.
 
@@ -195,6 +205,8 @@ class Bernoulli(RandomVariable):
 
   See :class:`edward.stats.distributions.Bernoulli`
   """
+  param_names = ('p', )
+
   def __init__(self, shape=1, p=None):
     super(Bernoulli, self).__init__(shape)
     self.n_params = self.n_vars
@@ -203,7 +215,7 @@ class Bernoulli(RandomVariable):
     self.is_reparameterized = True
 
     if p is None:
-      p_unconst = tf.Variable(tf.random_normal(self.shape))
+      p_unconst = tf.Variable(tf.random_normal(self.shape), name='p')
       p = tf.sigmoid(p_unconst)
 
     self.p = p
@@ -232,6 +244,8 @@ class Beta(RandomVariable):
 
   See :class:`edward.stats.distributions.Beta`
   """
+  param_names = ('alpha', 'beta')
+
   def __init__(self, shape=1, alpha=None, beta=None):
     super(Beta, self).__init__(shape)
     self.n_params = 2 * self.n_vars
@@ -240,11 +254,11 @@ class Beta(RandomVariable):
     self.is_reparameterized = False
 
     if alpha is None:
-      alpha_unconst = tf.Variable(tf.random_normal(self.shape))
+      alpha_unconst = tf.Variable(tf.random_normal(self.shape), name='alpha')
       alpha = tf.nn.softplus(alpha_unconst)
 
     if beta is None:
-      beta_unconst = tf.Variable(tf.random_normal(self.shape))
+      beta_unconst = tf.Variable(tf.random_normal(self.shape), name='beta')
       beta = tf.nn.softplus(beta_unconst)
 
     self.alpha = alpha
@@ -281,6 +295,8 @@ class Dirichlet(RandomVariable):
 
   See :class:`edward.stats.distributions.Dirichlet`
   """
+  param_names = ('alpha', )
+
   def __init__(self, shape, alpha=None):
     super(Dirichlet, self).__init__(shape)
     self.n_params = self.n_vars
@@ -289,7 +305,7 @@ class Dirichlet(RandomVariable):
     self.is_reparameterized = False
 
     if alpha is None:
-      alpha_unconst = tf.Variable(tf.random_normal(self.shape))
+      alpha_unconst = tf.Variable(tf.random_normal(self.shape), name='alpha')
       alpha = tf.nn.softplus(alpha_unconst)
 
     self.alpha = alpha
@@ -323,11 +339,64 @@ class Dirichlet(RandomVariable):
     return tf.reduce_sum(dirichlet.entropy(self.alpha))
 
 
+class Gamma(RandomVariable):
+  """Gamma
+
+  See :class:`edward.stats.distributions.Gamma`
+  """
+  param_names = ('alpha', 'beta')
+
+  def __init__(self, shape=1, alpha=None, beta=None):
+    super(Gamma, self).__init__(shape)
+    self.n_params = 2 * self.n_vars
+    self.is_differentiable = True
+    self.is_multivariate = False
+    self.is_reparameterized = False
+
+    if alpha is None:
+      alpha_unconst = tf.Variable(tf.random_normal(self.shape), name='alpha')
+      alpha = tf.nn.softplus(alpha_unconst) + 1e-2
+
+    if beta is None:
+      beta_unconst = tf.Variable(tf.random_normal(self.shape), name='beta')
+      beta = tf.nn.softplus(beta_unconst) + 1e-2
+
+    self.alpha = alpha
+    self.beta = beta
+
+  def __str__(self):
+    sess = get_session()
+    a, b = sess.run([self.alpha, self.beta])
+    return "shape: \n" + a.__str__() + "\n" + \
+           "scale: \n" + b.__str__()
+
+  def sample(self, n=1):
+    # Define Python function which returns samples as a Numpy
+    # array. This is necessary for sampling from distributions
+    # unavailable in TensorFlow natively.
+    def np_sample(a, scale):
+      # get ``n`` from lexical scoping
+      return gamma.rvs(a, scale=scale, size=n).astype(np.float32)
+
+    x = tf.py_func(np_sample, [self.alpha, self.beta], [tf.float32])[0]
+    x.set_shape((n, ) + self.shape)  # set shape from unknown shape
+    return x
+
+  def log_prob_idx(self, idx, xs):
+    full_idx = (slice(0, None), ) + idx  # slice over sample size
+    return gamma.logpdf(xs[full_idx], self.alpha[idx], self.beta[idx])
+
+  def entropy(self):
+    return tf.reduce_sum(gamma.entropy(self.alpha, self.beta))
+
+
 class InvGamma(RandomVariable):
   """Inverse Gamma
 
   See :class:`edward.stats.distributions.InvGamma`
   """
+  param_names = ('alpha', 'beta')
+
   def __init__(self, shape=1, alpha=None, beta=None):
     super(InvGamma, self).__init__(shape)
     self.n_params = 2 * self.n_vars
@@ -336,11 +405,11 @@ class InvGamma(RandomVariable):
     self.is_reparameterized = False
 
     if alpha is None:
-      alpha_unconst = tf.Variable(tf.random_normal(self.shape))
+      alpha_unconst = tf.Variable(tf.random_normal(self.shape), name='alpha')
       alpha = tf.nn.softplus(alpha_unconst) + 1e-2
 
     if beta is None:
-      beta_unconst = tf.Variable(tf.random_normal(self.shape))
+      beta_unconst = tf.Variable(tf.random_normal(self.shape), name='beta')
       beta = tf.nn.softplus(beta_unconst) + 1e-2
 
     self.alpha = alpha
@@ -388,6 +457,8 @@ class Multinomial(RandomVariable):
   distribution), it assumes a single trial (n=1) when sampling and
   calculating the density.
   """
+  param_names = ('pi', )
+
   def __init__(self, shape, pi=None):
     super(Multinomial, self).__init__(shape)
     if self.shape[-1] == 1:
@@ -401,7 +472,8 @@ class Multinomial(RandomVariable):
     if pi is None:
       real_shape = self.shape[:-1]
       K_minus_one = self.shape[-1] - 1
-      pi_unconst = tf.Variable(tf.random_normal([real_shape + (K_minus_one, )]))
+      pi_unconst = tf.Variable(tf.random_normal([real_shape + (K_minus_one, )]),
+                                name='pi')
       pi = to_simplex(pi_unconst)
 
     self.pi = pi
@@ -442,6 +514,8 @@ class Normal(RandomVariable):
 
   See :class:`edward.stats.distributions.Norm`
   """
+  param_names = ('loc', 'scale')
+
   def __init__(self, shape=1, loc=None, scale=None):
     super(Normal, self).__init__(shape)
     self.n_params = 2 * self.n_vars
@@ -450,10 +524,10 @@ class Normal(RandomVariable):
     self.is_reparameterized = True
 
     if loc is None:
-      loc = tf.Variable(tf.random_normal(self.shape))
+      loc = tf.Variable(tf.random_normal(self.shape), name='loc')
 
     if scale is None:
-      scale_unconst = tf.Variable(tf.random_normal(self.shape))
+      scale_unconst = tf.Variable(tf.random_normal(self.shape), name='scale')
       scale = tf.nn.softplus(scale_unconst)
 
     self.loc = loc
@@ -489,6 +563,8 @@ class PointMass(RandomVariable):
   params : tf.Tensor, optional
        If not specified, everything initialized to :math:`\mathcal{N}(0,1)`.
   """
+  param_names = ('params', )
+
   def __init__(self, shape=1, params=None):
     super(PointMass, self).__init__(shape)
     self.n_params = self.n_vars
@@ -497,7 +573,7 @@ class PointMass(RandomVariable):
     self.is_reparameterized = True
 
     if params is None:
-      params = tf.Variable(tf.random_normal(self.shape))
+      params = tf.Variable(tf.random_normal(self.shape), name='params')
 
     self.params = params
 
@@ -532,3 +608,161 @@ class PointMass(RandomVariable):
     """
     full_idx = (slice(0, None), ) + idx  # slice over sample size
     return tf.cast(tf.equal(xs[full_idx], self.params[idx]), dtype=tf.float32)
+
+
+_KL_REGISTRY = {}
+
+
+def register_kl(type_q, type_p):
+  """Decorator to register an analytic KL divergence between two
+  types of random variables.
+
+  Parameters
+  ----------
+  type_q : type
+    Subclass of ``RandomVariable`` for the first argument.
+  type_p : type
+    Subclass of ``RandomVariable`` for the second argument.
+
+  Returns
+  -------
+  function
+    Decorator which registers a function ``kl(q, p)`` returning
+    ``KL(q || p)`` as a 0-D tensor, summed over all random variables
+    of the two layers.
+
+  Examples
+  --------
+  >>> @register_kl(Normal, Normal)
+  ... def _kl_normal_normal(q, p):
+  ...   ...
+  """
+  def decorator(fn):
+    _KL_REGISTRY[type_q, type_p] = fn
+    return fn
+
+  return decorator
+
+
+def _lookup_kl(type_q, type_p):
+  """Return the registered KL function for the most specific pair of
+  base classes, or ``None`` if there is none."""
+  for base_q in type_q.__mro__:
+    for base_p in type_p.__mro__:
+      fn = _KL_REGISTRY.get((base_q, base_p))
+      if fn is not None:
+        return fn
+
+  return None
+
+
+def has_kl(q, p):
+  """Return whether an analytic ``KL(q || p)`` is registered for the
+  types of ``q`` and ``p``."""
+  return _lookup_kl(type(q), type(p)) is not None
+
+
+def kl_divergence(q, p):
+  """Analytic KL divergence between two random variables.
+
+  ``KL( q(x | params_q) || p(x | params_p) )
+  = sum_{idx in shape} KL( q(x[idx] | params_q[idx]) ||
+                           p(x[idx] | params_p[idx]) )``
+
+  Parameters
+  ----------
+  q : RandomVariable
+  p : RandomVariable
+    Random variable of the same shape as ``q``.
+
+  Returns
+  -------
+  tf.Tensor
+    A 0-D tensor.
+
+  Raises
+  ------
+  NotImplementedError
+    If no analytic KL is registered for the types of ``q`` and ``p``.
+  """
+  fn = _lookup_kl(type(q), type(p))
+  if fn is None:
+    raise NotImplementedError(
+        "No analytic KL registered for ({}, {}).".format(
+            type(q).__name__, type(p).__name__))
+
+  return fn(q, p)
+
+
+@register_kl(Normal, Normal)
+def _kl_normal_normal(q, p):
+  loc_q = tf.cast(q.loc, tf.float32)
+  scale_q = tf.cast(q.scale, tf.float32)
+  loc_p = tf.cast(p.loc, tf.float32)
+  scale_p = tf.cast(p.scale, tf.float32)
+  return tf.reduce_sum(
+      tf.log(scale_p) - tf.log(scale_q) +
+      (tf.square(scale_q) + tf.square(loc_q - loc_p)) /
+      (2.0 * tf.square(scale_p)) - 0.5)
+
+
+@register_kl(Gamma, Gamma)
+def _kl_gamma_gamma(q, p):
+  a_q = tf.cast(q.alpha, tf.float32)
+  scale_q = tf.cast(q.beta, tf.float32)
+  a_p = tf.cast(p.alpha, tf.float32)
+  scale_p = tf.cast(p.beta, tf.float32)
+  return tf.reduce_sum(
+      (a_q - a_p) * tf.digamma(a_q) - tf.lgamma(a_q) + tf.lgamma(a_p) +
+      a_p * (tf.log(scale_p) - tf.log(scale_q)) +
+      a_q * (scale_q / scale_p - 1.0))
+
+
+@register_kl(Beta, Beta)
+def _kl_beta_beta(q, p):
+  a_q = tf.cast(q.alpha, tf.float32)
+  b_q = tf.cast(q.beta, tf.float32)
+  a_p = tf.cast(p.alpha, tf.float32)
+  b_p = tf.cast(p.beta, tf.float32)
+  return tf.reduce_sum(
+      tf.lgamma(a_p) + tf.lgamma(b_p) - tf.lgamma(a_p + b_p) -
+      tf.lgamma(a_q) - tf.lgamma(b_q) + tf.lgamma(a_q + b_q) +
+      (a_q - a_p) * tf.digamma(a_q) + (b_q - b_p) * tf.digamma(b_q) +
+      (a_p - a_q + b_p - b_q) * tf.digamma(a_q + b_q))
+
+
+@register_kl(Dirichlet, Dirichlet)
+def _kl_dirichlet_dirichlet(q, p):
+  alpha_q = tf.cast(q.alpha, tf.float32)
+  alpha_p = tf.cast(p.alpha, tf.float32)
+  multivariate_idx = len(q.shape) - 1
+  sum_q = tf.reduce_sum(alpha_q, multivariate_idx, True)
+  sum_p = tf.reduce_sum(alpha_p, multivariate_idx, True)
+  return tf.reduce_sum(tf.lgamma(sum_q) - tf.lgamma(sum_p)) + \
+      tf.reduce_sum(
+          tf.lgamma(alpha_p) - tf.lgamma(alpha_q) +
+          (alpha_q - alpha_p) * (tf.digamma(alpha_q) - tf.digamma(sum_q)))
+
+
+@register_kl(Bernoulli, Bernoulli)
+def _kl_bernoulli_bernoulli(q, p):
+  # Clip inside the logs so that 0 * log 0 evaluates to 0.
+  tiny = np.finfo(np.float32).tiny
+  p_q = tf.cast(q.p, tf.float32)
+  p_p = tf.cast(p.p, tf.float32)
+  return tf.reduce_sum(
+      p_q * (tf.log(tf.maximum(p_q, tiny)) -
+             tf.log(tf.maximum(p_p, tiny))) +
+      (1.0 - p_q) * (tf.log(tf.maximum(1.0 - p_q, tiny)) -
+                     tf.log(tf.maximum(1.0 - p_p, tiny))))
+
+
+@register_kl(Multinomial, Multinomial)
+def _kl_multinomial_multinomial(q, p):
+  # Both layers assume a single trial, so this is the KL between
+  # categorical distributions.
+  tiny = np.finfo(np.float32).tiny
+  pi_q = tf.cast(q.pi, tf.float32)
+  pi_p = tf.cast(p.pi, tf.float32)
+  return tf.reduce_sum(pi_q * (tf.log(tf.maximum(pi_q, tiny)) -
+                               tf.log(tf.maximum(pi_p, tiny))))
@@ -0,0 +1,166 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import csv
+import json
+import tensorflow as tf
+import threading
+
+from six.moves import queue
+
+
+class Sink(object):
+    """Base class for sinks of training records.
+
+    A record is a dictionary with the iteration ``step``, the ``loss``,
+    the mean ``step_time`` in seconds since the last record, the
+    ``examples_per_sec`` if the number of data points per iteration is
+    known, and summaries of the variational parameters, e.g.,
+    ``layer0/loc/mean``. All values are numbers.
+    """
+    def write(self, record):
+        """Write a record.
+
+        Parameters
+        ----------
+        record : dict
+        """
+        raise NotImplementedError()
+
+    def flush(self):
+        """Wait for all records written so far to be stored."""
+        pass
+
+    def close(self):
+        """Store all records and release any resources."""
+        pass
+
+
+class MemorySink(Sink):
+    """Keep records in memory, in ``self.records``.
+
+    Parameters
+    ----------
+    maxlen : int, optional
+        Number of most recent records to keep. Default is all.
+    """
+    def __init__(self, maxlen=None):
+        self.records = collections.deque(maxlen=maxlen)
+
+    def write(self, record):
+        self.records.append(record)
+
+
+class _FileSink(Sink):
+    """Write records to a file in a background thread, so that writing
+    does not block training.
+
+    If writing a record fails, the later records are dropped, and the
+    error is raised by ``flush`` and ``close``.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'w')
+        self._error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def write(self, record):
+        self._queue.put(record)
+
+    def flush(self):
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._file.close()
+
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    break
+
+                if self._error is None:
+                    self._write_record(record)
+                    self._file.flush()
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_record(self, record):
+        raise NotImplementedError()
+
+
+class CSVSink(_FileSink):
+    """Write records to a CSV file, one row per record. The columns
+    are the keys of the first record.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, which is overwritten.
+    """
+    def __init__(self, path):
+        self._writer = None
+        super(CSVSink, self).__init__(path)
+
+    def _write_record(self, record):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, sorted(record),
+                                          extrasaction='ignore',
+                                          lineterminator='\n')
+            self._writer.writeheader()
+
+        self._writer.writerow(record)
+
+
+class JSONLinesSink(_FileSink):
+    """Write records to a file as JSON, one line per record.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, which is overwritten.
+    """
+    def _write_record(self, record):
+        self._file.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+class TensorBoardSink(Sink):
+    """Write records as TensorBoard scalar summaries, one per key.
+
+    Parameters
+    ----------
+    logdir : str
+        Directory to write event files to.
+    """
+    def __init__(self, logdir):
+        self._writer = tf.train.SummaryWriter(logdir)
+
+    def write(self, record):
+        summary = tf.Summary(value=[
+            tf.Summary.Value(tag=key, simple_value=value)
+            for key, value in sorted(record.items()) if key != 'step'])
+        self._writer.add_summary(summary, record['step'])
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
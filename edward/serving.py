@@ -0,0 +1,277 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import numpy as np
+import six
+import tensorflow as tf
+import threading
+import time
+
+from edward.models import PosteriorSamples
+from edward.util import get_session
+from six.moves import BaseHTTPServer, queue, socketserver
+
+
+class Predictor(object):
+    """Serve predictions from a fitted model.
+
+    The ``predict`` graph is built once, on placeholders for the data,
+    with a fixed set of posterior samples cached in the graph. Each
+    request then costs a single session run.
+
+    Requests may be made concurrently from many threads. With
+    ``start()``, a worker thread collects requests arriving within
+    ``max_latency`` seconds of each other into one batch of at most
+    ``max_batch_size`` data points, and makes the predictions for the
+    batch in one session run.
+    """
+    def __init__(self, model, variational, data, n_samples=100,
+                 max_batch_size=256, max_latency=0.001):
+        """
+        Parameters
+        ----------
+        model : ed.Model
+            Probability model, a class object with an implemented
+            ``predict`` method.
+        variational : ed.Variational or ed.PosteriorSamples
+            Posterior approximation to draw the cached samples from, or
+            a fixed bank of samples.
+        data : dict
+            Example data dictionary, whose keys are the model's data
+            keys and whose values are NumPy arrays with an outer
+            dimension indexing data points. It fixes the data type and
+            the shape of each data point for requests.
+        n_samples : int, optional
+            Number of posterior samples to average predictions over.
+        max_batch_size : int, optional
+            Maximum number of data points to predict in one batch of
+            requests.
+        max_latency : float, optional
+            Maximum time in seconds to wait for further requests to add
+            to a batch.
+        """
+        self.sess = get_session()
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        if not isinstance(variational, PosteriorSamples):
+            variational = PosteriorSamples.draw(variational, n_samples)
+
+        self.samples = variational
+        data = {key: np.asarray(value) for key, value in six.iteritems(data)}
+        self.x_ph = {key: tf.placeholder(tf.as_dtype(value.dtype),
+                                         (None, ) + value.shape[1:])
+                     for key, value in six.iteritems(data)}
+        self.y_pred = model.predict(self.x_ph, variational.sample(n_samples))
+
+        self._queue = queue.Queue()
+        self._thread = None
+        # Guards ``self._thread``, so that no request is queued after
+        # the worker is told to stop.
+        self._lock = threading.Lock()
+
+    def predict(self, data):
+        """
+        Make predictions for a batch of data points. If the worker is
+        started, the request is batched with concurrent requests.
+
+        Parameters
+        ----------
+        data : dict
+            Data dictionary with the same keys as the example data.
+            Values are array-like, with an outer dimension indexing
+            data points.
+
+        Returns
+        -------
+        np.ndarray
+            Predictions, with an outer dimension indexing data points.
+        """
+        request = _Request(self._convert(data))
+        with self._lock:
+            batched = self._thread is not None
+            if batched:
+                self._queue.put(request)
+
+        if not batched:
+            self._run_batch([request])
+
+        return request.result()
+
+    def start(self):
+        """Start the worker thread which batches concurrent requests."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve_batches)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread, after it serves pending requests.
+        Later requests are predicted in the calling thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+
+            self._queue.put(None)
+            self._thread = None
+
+        thread.join()
+
+    def serve(self, host='127.0.0.1', port=8000):
+        """
+        Build an HTTP server for predictions, and start the worker
+        thread. Call ``serve_forever()`` on the server to serve.
+
+        Each POST request has a JSON body mapping data keys to nested
+        lists of data points. The response has a JSON body
+        ``{"predictions": [...]}``, or ``{"error": "..."}`` with
+        status 400 if the request fails.
+
+        Parameters
+        ----------
+        host : str, optional
+            Host name to bind to.
+        port : int, optional
+            Port to bind to. If 0, bind to a free port.
+
+        Returns
+        -------
+        six.moves.BaseHTTPServer.HTTPServer
+            The server, which handles each request in its own thread.
+        """
+        predictor = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers['Content-Length'])
+                    data = json.loads(self.rfile.read(length).decode('utf-8'))
+                    y_pred = predictor.predict(data)
+                    status = 200
+                    body = {'predictions': y_pred.tolist()}
+                except Exception as e:
+                    status = 400
+                    body = {'error': str(e)}
+
+                body = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.start()
+        return _ThreadingHTTPServer((host, port), Handler)
+
+    def _convert(self, data):
+        """Convert a request's data to arrays, checking them before
+        they are batched with other requests."""
+        if set(data) != set(self.x_ph):
+            raise KeyError("Data keys must be {}.".format(sorted(self.x_ph)))
+
+        data = {key: np.asarray(value,
+                                dtype=self.x_ph[key].dtype.as_numpy_dtype)
+                for key, value in six.iteritems(data)}
+        for key, value in six.iteritems(data):
+            shape = self.x_ph[key].get_shape()
+            if value.ndim != shape.ndims or \
+                    not shape[1:].is_compatible_with(value.shape[1:]):
+                raise ValueError("Data points of {} must have shape {}, "
+                                 "not {}.".format(key, shape[1:].as_list(),
+                                                  list(value.shape[1:])))
+
+        if len(set(len(value) for value in six.itervalues(data))) > 1:
+            raise ValueError("All data values must have the same number "
+                             "of data points.")
+
+        return data
+
+    def _feed_dict(self, datas):
+        return {ph: np.concatenate([data[key] for data in datas])
+                for key, ph in six.iteritems(self.x_ph)}
+
+    def _serve_batches(self):
+        stop = False
+        while not stop:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            requests = [request]
+            size = request.size
+            deadline = time.time() + self.max_latency
+            while size < self.max_batch_size:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    stop = True
+                    break
+
+                requests += [request]
+                size += request.size
+
+            self._run_batch(requests)
+
+    def _run_batch(self, requests):
+        sizes = [request.size for request in requests]
+        try:
+            y_pred = self.sess.run(
+                self.y_pred,
+                self._feed_dict([request.data for request in requests]))
+            if np.ndim(y_pred) == 0 or len(y_pred) != sum(sizes):
+                raise ValueError("The model returned predictions of shape "
+                                 "{} for a batch of {} data points.".format(
+                                     np.shape(y_pred), sum(sizes)))
+
+            values = np.split(y_pred, np.cumsum(sizes)[:-1])
+        except Exception as e:
+            for request in requests:
+                request.set_error(e)
+            return
+
+        for request, value in zip(requests, values):
+            request.set_result(value)
+
+
+class _Request(object):
+    """A pending prediction request."""
+    def __init__(self, data):
+        self.data = data
+        self.size = len(list(six.itervalues(data))[0])
+        self._event = threading.Event()
+        self._value = None
+        self._error = None
+
+    def set_result(self, value):
+        self._value = value
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def result(self):
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+
+        return self._value
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                           BaseHTTPServer.HTTPServer):
+    daemon_threads = True
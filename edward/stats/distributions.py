@@ -6,7 +6,6 @@ import numpy as np
 import tensorflow as tf
 
 from edward.util import dot, get_dims
-from itertools import product
 from scipy import stats
 
 
@@ -88,7 +87,11 @@ class Bernoulli(object):
             A tensor of same shape as input.
         """
         p = tf.cast(p, dtype=tf.float32)
-        return -p * tf.log(p) - (1.0 - p) * tf.log(1.0-p)
+        # Bound the arguments of the logarithms away from zero, so that
+        # p = 0 or p = 1 contributes zero rather than NaN.
+        tiny = np.finfo(np.float32).tiny
+        return -p * tf.log(tf.maximum(p, tiny)) - \
+               (1.0 - p) * tf.log(tf.maximum(1.0 - p, tiny))
 
 
 class Beta(object):
@@ -173,17 +176,12 @@ class Beta(object):
         """
         a = tf.cast(tf.squeeze(a), dtype=tf.float32)
         b = tf.cast(tf.squeeze(b), dtype=tf.float32)
-        if len(a.get_shape()) == 0:
-            return tf.lbeta(tf.pack([a, b])) - \
-                   (a - 1.0) * tf.digamma(a) - \
-                   (b - 1.0) * tf.digamma(b) + \
-                   (a + b - 2.0) * tf.digamma(a+b)
-        else:
-            return tf.lbeta(tf.concat(1,
-                         [tf.expand_dims(a, 1), tf.expand_dims(b, 1)])) - \
-                   (a - 1.0) * tf.digamma(a) - \
-                   (b - 1.0) * tf.digamma(b) + \
-                   (a + b - 2.0) * tf.digamma(a+b)
+        # Write the log beta function in terms of lgamma, which works
+        # for tensors of any shape and avoids packing the arguments.
+        return tf.lgamma(a) + tf.lgamma(b) - tf.lgamma(a + b) - \
+               (a - 1.0) * tf.digamma(a) - \
+               (b - 1.0) * tf.digamma(b) + \
+               (a + b - 2.0) * tf.digamma(a + b)
 
 
 class Binom(object):
@@ -249,12 +247,42 @@ class Binom(object):
                x * tf.log(p) + (n - x) * tf.log(1.0-p)
 
     def entropy(self, n, p):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        n : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`n >
+            0`.
+        p : tf.Tensor
+            A tensor of same shape as ``n``, and with all elements
+            constrained to :math:`p\in(0,1)`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
+
+        Notes
+        -----
+        There is no closed form; we sum over the support exactly,
+        which takes :math:`O(n)` work per element.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        n = tf.cast(n, dtype=tf.float32)
+        p = tf.cast(p, dtype=tf.float32)
+        zeros = tf.zeros_like(n + p)
+        shape = tf.shape(zeros)
+        n = tf.reshape(n + zeros, [-1, 1])
+        p = tf.reshape(p + zeros, [-1, 1])
+        # Sum over the support 0, ..., max(n), masking out values
+        # above each element's number of trials.
+        x = tf.cast(tf.range(0, tf.cast(tf.reduce_max(n), tf.int32) + 1),
+                    dtype=tf.float32)
+        mask = tf.cast(tf.less_equal(x, n), dtype=tf.float32)
+        x = tf.minimum(x, n)
+        logpmf = self.logpmf(x, n, p)
+        return tf.reshape(
+            -tf.reduce_sum(mask * tf.exp(logpmf) * logpmf, 1), shape)
 
 
 class Chi2(object):
@@ -311,12 +339,22 @@ class Chi2(object):
                0.5*df * tf.log(2.0) - tf.lgamma(0.5*df)
 
     def entropy(self, df):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        df : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`df >
+            0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        df = tf.cast(df, dtype=tf.float32)
+        return 0.5*df + tf.log(2.0) + tf.lgamma(0.5*df) + \
+               (1.0 - 0.5*df) * tf.digamma(0.5*df)
 
 
 class Dirichlet(object):
@@ -459,12 +497,21 @@ class Expon(object):
         return - x/scale - tf.log(scale)
 
     def entropy(self, scale=1):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        scale : tf.Tensor
+            A n-D tensor with all elements constrained to
+            :math:`scale > 0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        scale = tf.cast(scale, dtype=tf.float32)
+        return 1.0 + tf.log(scale)
 
 
 class Gamma(object):
@@ -606,12 +653,21 @@ class Geom(object):
         return (x-1) * tf.log(1.0-p) + tf.log(p)
 
     def entropy(self, p):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        p : tf.Tensor
+            A n-D tensor with all elements constrained to
+            :math:`p\in(0,1)`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        p = tf.cast(p, dtype=tf.float32)
+        return -((1.0 - p) * tf.log(1.0 - p) + p * tf.log(p)) / p
 
 
 class InvGamma(object):
@@ -702,7 +758,7 @@ class InvGamma(object):
         """
         a = tf.cast(a, dtype=tf.float32)
         scale = tf.cast(scale, dtype=tf.float32)
-        return a + tf.log(scale*tf.exp(tf.lgamma(a))) - \
+        return a + tf.log(scale) + tf.lgamma(a) - \
                (1.0 + a) * tf.digamma(a)
 
 
@@ -760,12 +816,21 @@ class LogNorm(object):
                0.5*tf.square(tf.log(x) / s)
 
     def entropy(self, s):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        s : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`s >
+            0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        s = tf.cast(s, dtype=tf.float32)
+        return 0.5 + 0.5*tf.log(2*np.pi) + tf.log(s)
 
 
 class Multinomial(object):
@@ -845,35 +910,68 @@ class Multinomial(object):
                    tf.reduce_sum(x * tf.log(p), multivariate_idx)
 
     def entropy(self, n, p):
-        """TODO
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        n : tf.Tensor
+            A tensor of one less dimension than ``p``, representing
+            the number of outcomes.
+        p : tf.Tensor
+            A n-D tensor for n >= 1, where the inner (right-most)
+            dimension represents the multivariate dimension, with
+            probabilities which sum to 1.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of one dimension less than the input.
+
+        Notes
+        -----
+        For a single trial, the entropy is that of the categorical
+        distribution, :math:`-\sum_k p_k \log p_k`. In general,
+
+        .. math::
+
+            H = -\log n! - n \sum_k p_k \log p_k
+                + \sum_k \mathbb{E}[\log x_k!],
+
+        where each count :math:`x_k` is marginally
+        :math:`\text{Binomial}(n, p_k)`. The expectations are sums
+        over :math:`0, \ldots, n`, which takes :math:`O(nk)` work
+        rather than enumerating all configurations of the counts.
         """
-        # Note that given n and p where p is a probability vector of
-        # length k, the entropy requires a sum over all
-        # possible configurations of a k-vector which sums to n. It's
-        # expensive.
-        # http://stackoverflow.com/questions/36435754/generating-a-numpy-array-with-all-combinations-of-numbers-that-sum-to-less-than
-        sess = tf.Session()
-        n = sess.run(tf.cast(tf.squeeze(n), dtype=tf.int32))
-        sess.close()
-        p = tf.cast(tf.squeeze(p), dtype=tf.float32)
-        if isinstance(n, np.int32):
-            k = get_dims(p)[0]
-            max_range = np.zeros(k, dtype=np.int32) + n
-            x = np.array([i for i in product(*(range(i+1) for i in max_range))
-                                 if sum(i)==n])
-            logpmf = self.logpmf(x, n, p)
-            return tf.reduce_sum(tf.exp(logpmf) * logpmf)
-        else:
-            out = []
-            for j in range(n.shape[0]):
-                k = get_dims(p)[0]
-                max_range = np.zeros(k, dtype=np.int32) + n[j]
-                x = np.array([i for i in product(*(range(i+1) for i in max_range))
-                              if sum(i)==n[j]])
-                logpmf = self.logpmf(x, n[j], p[j, :])
-                out += [tf.reduce_sum(tf.exp(logpmf) * logpmf)]
+        p = tf.cast(p, dtype=tf.float32)
+        multivariate_idx = len(get_dims(p)) - 1
+        # Probabilities of zero and one are clipped inside logarithms,
+        # so that terms with a zero coefficient vanish instead of
+        # evaluating to NaN.
+        tiny = np.finfo(np.float32).tiny
+        plogp = tf.reduce_sum(p * tf.log(tf.maximum(p, tiny)),
+                              multivariate_idx)
+        if not isinstance(n, tf.Tensor) and np.all(np.asarray(n) == 1):
+            return -plogp
 
-            return tf.pack(out)
+        n = tf.cast(n, dtype=tf.float32)
+        # Marginal binomial probabilities of each count j = 0, ..., n
+        # for each bucket, of shape p.shape + (max(n) + 1, ). Counts
+        # above n are masked out.
+        j = tf.cast(tf.range(0, tf.cast(tf.reduce_max(n), tf.int32) + 1),
+                    dtype=tf.float32)
+        n_ = tf.expand_dims(tf.expand_dims(n, multivariate_idx),
+                            multivariate_idx + 1)
+        p_ = tf.expand_dims(p, multivariate_idx + 1)
+        mask = tf.cast(tf.less_equal(j, n_), dtype=tf.float32)
+        j = tf.minimum(j, n_)
+        log_binom = tf.lgamma(n_ + 1.0) - tf.lgamma(j + 1.0) - \
+                    tf.lgamma(n_ - j + 1.0) + \
+                    j * tf.log(tf.maximum(p_, tiny)) + \
+                    (n_ - j) * tf.log(tf.maximum(1.0 - p_, tiny))
+        expected_log_factorial = tf.reduce_sum(
+            mask * tf.exp(log_binom) * tf.lgamma(j + 1.0),
+            [multivariate_idx, multivariate_idx + 1])
+        return -tf.lgamma(n + 1.0) - n * plogp + expected_log_factorial
 
 
 class Multivariate_Normal(object):
@@ -1072,12 +1170,55 @@ class NBinom(object):
                n * tf.log(p) + x * tf.log(1.0-p)
 
     def entropy(self, n, p):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        n : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`n >
+            0`.
+        p : tf.Tensor
+            A tensor of same shape as ``n``, and with all elements
+            constrained to :math:`p\in(0,1)`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
+
+        Notes
+        -----
+        There is no closed form; we sum over the support, truncated
+        20 standard deviations above the largest mean and capped at
+        10000 values. The tail of the distribution decays at least
+        geometrically, so the truncation error is negligible. Where
+        the truncated support would exceed the cap (small :math:`p`),
+        we use the entropy of the Gamma distribution with shape
+        :math:`n` and scale :math:`\\theta = (1-p)/p` that the
+        distribution tends to, :math:`n + \\log\\theta + \\log\\Gamma(n)
+        + (1-n)\\psi(n) + \\frac{1}{2\\theta}`. Its error is of order
+        :math:`\\theta^{-2}` for :math:`n \\ge 1`; for smaller
+        :math:`n` it is coarser, about :math:`\\theta^{-1}`.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        n = tf.cast(n, dtype=tf.float32)
+        p = tf.cast(p, dtype=tf.float32)
+        zeros = tf.zeros_like(n + p)
+        shape = tf.shape(zeros)
+        n = tf.reshape(n + zeros, [-1, 1])
+        p = tf.reshape(p + zeros, [-1, 1])
+        mean = n * (1.0 - p) / p
+        std = tf.sqrt(n * (1.0 - p)) / p
+        support = mean + 20.0*std + 20.0
+        x_max = tf.cast(tf.ceil(tf.reduce_max(support)), tf.int32)
+        x = tf.cast(tf.range(0, tf.minimum(x_max, 10000)), dtype=tf.float32)
+        logpmf = self.logpmf(x, n, p)
+        series = -tf.reduce_sum(tf.exp(logpmf) * logpmf, 1, True)
+        theta = (1.0 - p) / p
+        asymptotic = n + tf.log(theta) + tf.lgamma(n) + \
+                     (1.0 - n) * tf.digamma(n) + 0.5 / theta
+        return tf.reshape(
+            tf.select(tf.greater(support, 10000.0), asymptotic, series),
+            shape)
 
 
 class Norm(object):
@@ -1213,12 +1354,44 @@ class Poisson(object):
         return x * tf.log(mu) - mu - tf.lgamma(x + 1.0)
 
     def entropy(self, mu):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        mu : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`mu >
+            0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
+
+        Notes
+        -----
+        The entropy is :math:`\mu - \mu\log\mu + \mathbb{E}[\log
+        x!]`. For :math:`\mu \le 30` we sum the expectation over the
+        first 100 values of the support, which holds all but a
+        negligible amount of mass; above, we use the asymptotic
+        expansion :math:`\frac{1}{2}\log(2\pi e\mu) -
+        \frac{1}{12\mu} - \frac{1}{24\mu^2} -
+        \frac{19}{360\mu^3}`.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        mu = tf.cast(mu, dtype=tf.float32)
+        shape = tf.shape(mu)
+        # Each regime is evaluated on inputs clipped to its own region
+        # so the unselected branch is always finite.
+        mu_small = tf.reshape(tf.minimum(mu, 30.0), [-1, 1])
+        x = tf.cast(tf.range(0, 100), dtype=tf.float32)
+        logpmf = self.logpmf(x, mu_small)
+        series = mu_small - mu_small * tf.log(mu_small) + \
+                 tf.reduce_sum(tf.exp(logpmf) * tf.lgamma(x + 1.0), 1, True)
+        series = tf.reshape(series, shape)
+        mu_large = tf.maximum(mu, 30.0)
+        asymptotic = 0.5*tf.log(2*np.pi*np.e*mu_large) - \
+                     1.0/(12.0*mu_large) - 1.0/(24.0*tf.square(mu_large)) - \
+                     19.0/(360.0*tf.pow(mu_large, 3.0))
+        return tf.select(tf.greater(mu, 30.0), asymptotic, series)
 
 
 class T(object):
@@ -1293,12 +1466,110 @@ class T(object):
                0.5 * (df + 1.0) * tf.log(1.0 + (1.0/df) * tf.square(z))
 
     def entropy(self, df, loc=0, scale=1):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        df : tf.Tensor
+            A n-D tensor with all elements constrained to :math:`df >
+            0`.
+        loc : tf.Tensor
+            A n-D tensor.
+        scale : tf.Tensor
+            A n-D tensor with all elements constrained to
+            :math:`scale > 0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        df = tf.cast(df, dtype=tf.float32)
+        scale = tf.cast(scale, dtype=tf.float32)
+        return 0.5*(df + 1.0) * \
+               (tf.digamma(0.5*(df + 1.0)) - tf.digamma(0.5*df)) + \
+               0.5*tf.log(df) + tf.lgamma(0.5*df) + 0.5*np.log(np.pi) - \
+               tf.lgamma(0.5*(df + 1.0)) + tf.log(scale)
+
+
+def _log_ndtr(x):
+    """Log of the standard normal cumulative distribution function.
+
+    The complementary error function is accurate in the body of the
+    distribution; in the tails, where the CDF underflows or rounds to
+    one, we use an asymptotic series and a series for ``log1p``
+    respectively.
+    """
+    x = tf.cast(x, dtype=tf.float32)
+    # Each regime is evaluated on inputs clipped to its own region so
+    # that the unselected branches never produce Inf or NaN values,
+    # which would otherwise leak into the gradient of tf.select.
+    x_mid = tf.clip_by_value(x, -10.0, 3.0)
+    mid = tf.log(0.5 * tf.erfc(-x_mid / np.sqrt(2.0)))
+    x_low = tf.minimum(x, -10.0)
+    x2 = tf.square(x_low)
+    low = -0.5*x2 - tf.log(-x_low) - 0.5*np.log(2.0*np.pi) + \
+          tf.log(1.0 - 1.0/x2 + 3.0/tf.square(x2) - 15.0/tf.pow(x2, 3.0))
+    q = 0.5 * tf.erfc(tf.maximum(x, 3.0) / np.sqrt(2.0))
+    high = -q - 0.5*tf.square(q) - tf.pow(q, 3.0)/3.0
+    return tf.select(tf.less(x, -10.0), low,
+                     tf.select(tf.greater(x, 3.0), high, mid))
+
+
+def _log_ndtr_diff(a, b):
+    """Log of ``Phi(b) - Phi(a)`` for ``b > a``, where ``a`` and ``b``
+    are tensors of the same shape.
+    """
+    # Phi(b) - Phi(a) = Phi(-a) - Phi(-b); reflecting intervals that
+    # lie above zero avoids the cancellation of two CDFs close to one.
+    reflect = tf.greater(a, 0.0)
+    lower = tf.select(reflect, -b, a)
+    upper = tf.select(reflect, -a, b)
+    log_upper = _log_ndtr(upper)
+    # log(1 - exp(d)) for d < 0; expm1 keeps it accurate when the
+    # interval is narrow, i.e., d is close to zero.
+    return log_upper + tf.log(-tf.expm1(_log_ndtr(lower) - log_upper))
+
+
+def _ndtri_log(log_p):
+    """Inverse of the standard normal cumulative distribution
+    function, evaluated at ``exp(log_p)``.
+
+    This is Acklam's rational approximation, with a relative error
+    below 1.2e-9. The lower tail depends on ``p`` only through
+    ``log(p)``, so it stays accurate when ``p`` underflows.
+    """
+    a = [-3.969683028665376e+01, 2.209460984245205e+02,
+         -2.759285104469687e+02, 1.383577518672690e+02,
+         -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02,
+         -1.556989798598866e+02, 6.680131188771972e+01,
+         -1.328068155288572e+01, 1.0]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01,
+         -2.400758277161838e+00, -2.549732539343734e+00,
+         4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01,
+         2.445134137142996e+00, 3.754408661907416e+00, 1.0]
+
+    def polyval(coeffs, x):
+        out = coeffs[0]
+        for coeff in coeffs[1:]:
+            out = out*x + coeff
+        return out
+
+    p_low = 0.02425
+    log_p = tf.cast(log_p, dtype=tf.float32)
+    q = tf.sqrt(-2.0 * tf.minimum(log_p, np.log(p_low)))
+    low = polyval(c, q) / polyval(d, q)
+    q = tf.clip_by_value(tf.exp(log_p), p_low, 1.0 - p_low) - 0.5
+    r = tf.square(q)
+    mid = polyval(a, r) * q / polyval(b, r)
+    q = 1.0 - tf.maximum(tf.exp(log_p), 1.0 - p_low)
+    q = tf.sqrt(-2.0 * tf.log(tf.maximum(q, np.finfo(np.float32).eps)))
+    high = -polyval(c, q) / polyval(d, q)
+    return tf.select(tf.less(log_p, np.log(p_low)), low,
+                     tf.select(tf.greater(log_p, np.log(1.0 - p_low)),
+                               high, mid))
 
 
 class TruncNorm(object):
@@ -1347,6 +1618,54 @@ class TruncNorm(object):
         x = np.asarray(x).transpose()
         return x
 
+    def sample(self, a, b, loc=0, scale=1, size=1):
+        """Random variates, drawn in the computational graph by
+        inverting the cumulative distribution function.
+
+        Unlike ``rvs``, the parameters may be tensors that depend on
+        other parts of the graph, and a fresh sample is drawn on every
+        run of the returned tensor.
+
+        Parameters
+        ----------
+        a : tf.Tensor
+            Left boundary, with respect to the standard normal.
+            0-D or 1-D tensor.
+        b : tf.Tensor
+            Right boundary, with respect to the standard normal.
+            0-D or 1-D tensor, and with ``b > a`` element-wise.
+        loc : tf.Tensor
+            0-D or 1-D tensor.
+        scale : tf.Tensor
+            0-D or 1-D tensor, with all elements constrained to
+            :math:`scale > 0`.
+        size : int
+            Number of random variable samples to return.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of dimensions size x shape.
+        """
+        a = tf.cast(a, dtype=tf.float32)
+        b = tf.cast(b, dtype=tf.float32)
+        loc = tf.cast(loc, dtype=tf.float32)
+        scale = tf.cast(scale, dtype=tf.float32)
+        shape = tf.shape(a + b + loc + scale)
+        u = tf.random_uniform(tf.concat(0, [[size], shape]))
+        zeros = tf.zeros_like(u)
+        a = a + zeros
+        b = b + zeros
+        # Sample in the lower half of the real line, where the CDF is
+        # accurate, and reflect back intervals lying above zero.
+        reflect = tf.greater(a, 0.0)
+        lower = tf.select(reflect, -b, a)
+        upper = tf.select(reflect, -a, b)
+        log_upper = _log_ndtr(upper)
+        ratio = tf.exp(_log_ndtr(lower) - log_upper)
+        z = _ndtri_log(log_upper + tf.log(ratio + u * (1.0 - ratio)))
+        return loc + scale * tf.select(reflect, -z, z)
+
     def logpdf(self, x, a, b, loc=0, scale=1):
         """Log of the probability density function.
 
@@ -1374,25 +1693,54 @@ class TruncNorm(object):
         """
         # Note there is no error checking if x is outside domain.
         x = tf.cast(x, dtype=tf.float32)
-        # This is slow, as we require use of stats.norm.cdf.
-        sess = tf.Session()
-        a = sess.run(tf.cast(a, dtype=tf.float32))
-        b = sess.run(tf.cast(b, dtype=tf.float32))
-        loc = sess.run(tf.cast(loc, dtype=tf.float32))
-        scale = sess.run(tf.cast(scale, dtype=tf.float32))
-        sess.close()
-        return -tf.log(scale) + norm.logpdf(x, loc, scale) - \
-               tf.log(tf.cast(stats.norm.cdf((b - loc)/scale) - \
-                      stats.norm.cdf((a - loc)/scale),
-                      dtype=tf.float32))
+        a = tf.cast(a, dtype=tf.float32)
+        b = tf.cast(b, dtype=tf.float32)
+        loc = tf.cast(loc, dtype=tf.float32)
+        scale = tf.cast(scale, dtype=tf.float32)
+        z = (x - loc) / scale
+        zeros = tf.zeros_like(z)
+        return -0.5*tf.log(2*np.pi) - tf.log(scale) - 0.5*tf.square(z) - \
+               _log_ndtr_diff(a + zeros, b + zeros)
 
     def entropy(self, a, b, loc=0, scale=1):
+        """Entropy of probability distribution.
+
+        Parameters
+        ----------
+        a : tf.Tensor
+            Left boundary, with respect to the standard normal.
+            A n-D tensor.
+        b : tf.Tensor
+            Right boundary, with respect to the standard normal.
+            A n-D tensor, and with ``b > a`` element-wise.
+        loc : tf.Tensor
+            A n-D tensor.
+        scale : tf.Tensor
+            A n-D tensor with all elements constrained to
+            :math:`scale > 0`.
+
+        Returns
+        -------
+        tf.Tensor
+            A tensor of same shape as input.
         """
-        Raises
-        ------
-        NotImplementedError
-        """
-        raise NotImplementedError()
+        a = tf.cast(a, dtype=tf.float32)
+        b = tf.cast(b, dtype=tf.float32)
+        scale = tf.cast(scale, dtype=tf.float32)
+        zeros = tf.zeros_like(a + b + scale)
+        a = a + zeros
+        b = b + zeros
+        log_z = _log_ndtr_diff(a, b)
+        # The ratios phi(a)/Z and phi(b)/Z are formed in log space, so
+        # they remain finite for intervals deep in the tails. Infinite
+        # boundaries contribute zero.
+        a = tf.clip_by_value(a, -40.0, 40.0)
+        b = tf.clip_by_value(b, -40.0, 40.0)
+        log_phi_a = -0.5*tf.square(a) - 0.5*np.log(2*np.pi)
+        log_phi_b = -0.5*tf.square(b) - 0.5*np.log(2*np.pi)
+        return 0.5*np.log(2*np.pi*np.e) + tf.log(scale) + log_z + \
+               0.5*(a * tf.exp(log_phi_a - log_z) -
+                    b * tf.exp(log_phi_b - log_z))
 
 
 class Uniform(object):
@@ -36,6 +36,8 @@ class BetaBernoulli(PythonModel):
 
 
 ed.set_seed(42)
+# Use ``BetaBernoulli(n_jobs=-1)`` to split the samples across a pool
+# of workers, one per CPU.
 model = BetaBernoulli()
 variational = Variational()
 variational.add(Beta())
@@ -48,6 +48,9 @@ class IWVI(MFVI):
         self.K = K
         return super(IWVI, self).initialize(*args, **kwargs)
 
+    def _graph_config(self):
+        return super(IWVI, self)._graph_config() + (self.K, )
+
     def build_loss(self):
         if self.score:
             return self.build_score_loss()
@@ -0,0 +1,136 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.models import Bernoulli, Beta, Dirichlet, Gamma, InvGamma, \
+    Multinomial, Normal, Variational, has_kl, kl_divergence
+from scipy import integrate, stats
+
+
+def _kl_quad(logpdf_q, logpdf_p, a, b):
+    """KL(q || p) of univariate densities by numerical quadrature."""
+    return integrate.quad(lambda x: np.exp(logpdf_q(x)) *
+                          (logpdf_q(x) - logpdf_p(x)), a, b)[0]
+
+
+class test_kl_divergence_class(tf.test.TestCase):
+
+    def test_normal_normal(self):
+        with self.test_session():
+            q = Normal(2, loc=tf.constant([0.5, -1.0]),
+                       scale=tf.constant([0.7, 2.0]))
+            p = Normal(2, loc=tf.constant([1.0, 0.0]),
+                       scale=tf.constant([1.5, 0.3]))
+            val_true = sum(_kl_quad(
+                lambda x: stats.norm.logpdf(x, lq, sq),
+                lambda x: stats.norm.logpdf(x, lp, sp), -np.inf, np.inf)
+                for lq, sq, lp, sp in
+                zip([0.5, -1.0], [0.7, 2.0], [1.0, 0.0], [1.5, 0.3]))
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+    def test_gamma_gamma(self):
+        with self.test_session():
+            q = Gamma(1, alpha=tf.constant([2.3]), beta=tf.constant([0.7]))
+            p = Gamma(1, alpha=tf.constant([1.5]), beta=tf.constant([2.0]))
+            val_true = _kl_quad(
+                lambda x: stats.gamma.logpdf(x, 2.3, scale=0.7),
+                lambda x: stats.gamma.logpdf(x, 1.5, scale=2.0), 0, np.inf)
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+    def test_beta_beta(self):
+        with self.test_session():
+            q = Beta(1, alpha=tf.constant([2.3]), beta=tf.constant([0.7]))
+            p = Beta(1, alpha=tf.constant([1.5]), beta=tf.constant([2.0]))
+            val_true = _kl_quad(
+                lambda x: stats.beta.logpdf(x, 2.3, 0.7),
+                lambda x: stats.beta.logpdf(x, 1.5, 2.0), 0, 1)
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true,
+                                rtol=1e-5)
+
+    def test_dirichlet_dirichlet(self):
+        with self.test_session():
+            alpha_q = np.array([[1.0, 2.0, 3.0], [0.5, 0.5, 4.0]],
+                               dtype=np.float32)
+            alpha_p = np.array([[2.0, 2.0, 2.0], [1.0, 3.0, 0.5]],
+                               dtype=np.float32)
+            q = Dirichlet((2, 3), alpha=tf.constant(alpha_q))
+            p = Dirichlet((2, 3), alpha=tf.constant(alpha_p))
+            # Monte Carlo estimate from samples of q.
+            val_true = 0.0
+            for a_q, a_p in zip(alpha_q, alpha_p):
+                x = np.random.dirichlet(a_q, size=200000)
+                val_true += np.mean(stats.dirichlet.logpdf(x.T, a_q) -
+                                    stats.dirichlet.logpdf(x.T, a_p))
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true,
+                                atol=0.05)
+
+    def test_bernoulli_bernoulli(self):
+        with self.test_session():
+            q = Bernoulli(2, p=tf.constant([0.2, 0.9]))
+            p = Bernoulli(2, p=tf.constant([0.5, 0.6]))
+            val_true = np.sum(stats.entropy([[0.2, 0.9], [0.8, 0.1]],
+                                            [[0.5, 0.6], [0.5, 0.4]]))
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+    def test_multinomial_multinomial(self):
+        with self.test_session():
+            q = Multinomial(3, pi=tf.constant([0.2, 0.3, 0.5]))
+            p = Multinomial(3, pi=tf.constant([0.6, 0.3, 0.1]))
+            val_true = stats.entropy([0.2, 0.3, 0.5], [0.6, 0.3, 0.1])
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+    def test_boundary(self):
+        with self.test_session():
+            q = Bernoulli(2, p=tf.constant([0.0, 1.0]))
+            p = Bernoulli(2, p=tf.constant([0.5, 0.6]))
+            val_true = np.sum(stats.entropy([[0.0, 1.0], [1.0, 0.0]],
+                                            [[0.5, 0.6], [0.5, 0.4]]))
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+            q = Multinomial(3, pi=tf.constant([0.0, 0.4, 0.6]))
+            p = Multinomial(3, pi=tf.constant([0.6, 0.3, 0.1]))
+            val_true = stats.entropy([0.0, 0.4, 0.6], [0.6, 0.3, 0.1])
+            self.assertAllClose(kl_divergence(q, p).eval(), val_true)
+
+    def test_not_registered(self):
+        with self.test_session():
+            q = InvGamma(1, alpha=tf.constant([1.0]), beta=tf.constant([1.0]))
+            p = Normal(1, loc=tf.constant([0.0]), scale=tf.constant([1.0]))
+            assert not has_kl(q, p)
+            self.assertRaises(NotImplementedError, kl_divergence, q, p)
+
+    def test_mfvi(self):
+        class BetaModel:
+            """
+            p(x, z) = Bernoulli(x; z) Beta(z; 1, 1)
+            """
+            def __init__(self):
+                self.prior = Variational()
+                self.prior.add(Beta(alpha=tf.ones(1), beta=tf.ones(1)))
+
+            def log_lik(self, xs, zs):
+                return tf.pack([tf.reduce_sum(
+                    xs['x'] * tf.log(z) + (1.0 - xs['x']) * tf.log(1.0 - z))
+                    for z in tf.unpack(zs)])
+
+        with self.test_session():
+            variational = Variational()
+            variational.add(Beta())
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
+                              dtype=np.float32)}
+            inference = ed.MFVI(BetaModel(), variational, data)
+            assert inference._is_kl_analytic()
+            inference.initialize(n_print=None)
+            val_true = kl_divergence(variational.layers[0],
+                                     inference.model.prior.layers[0])
+            self.assertAllClose(inference.build_kl().eval(), val_true.eval())
+
+            # InvGamma has no analytic KL to a Beta.
+            inference.model.prior = Variational()
+            inference.model.prior.add(InvGamma(alpha=tf.ones(1),
+                                               beta=tf.ones(1)))
+            assert not inference._is_kl_analytic()
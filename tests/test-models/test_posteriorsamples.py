@@ -0,0 +1,101 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import shutil
+import tempfile
+import tensorflow as tf
+
+from edward.models import PosteriorSamples, Variational, Normal
+
+
+class MeanModel:
+    """
+    Predicts the mean of the latent variable for every data point.
+    """
+    def predict(self, xs, zs):
+        return tf.reduce_mean(zs) + tf.zeros_like(xs['x'])
+
+
+class test_posteriorsamples_class(tf.test.TestCase):
+
+    def _variational(self):
+        variational = Variational()
+        variational.add(Normal(2, loc=tf.zeros(2), scale=tf.ones(2)))
+        variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+        return variational
+
+    def test_draw(self):
+        with self.test_session():
+            samples = PosteriorSamples.draw(self._variational(), 10,
+                                            batch_size=4)
+            self.assertEqual(len(samples), 10)
+            values = samples.values()
+            self.assertEqual(values[0].shape, (10, 2))
+            self.assertEqual(values[1].shape, (10, 1))
+            # Batches are all distinct draws.
+            self.assertFalse(np.allclose(values[0][:4], values[0][4:8]))
+            zs = samples.sample(3)
+            self.assertAllEqual(zs[0].eval(), values[0][:3])
+
+    def test_batches(self):
+        samples = PosteriorSamples(np.arange(10.0).reshape(5, 2))
+        batches = list(samples.batches(2))
+        self.assertEqual(len(batches), 3)
+        self.assertAllEqual(np.concatenate(batches), samples.values())
+        self.assertRaises(ValueError, samples.values, 6)
+
+    def test_sample_graph_size(self):
+        with self.test_session():
+            values = np.random.randn(1000, 100).astype(np.float32)
+            samples = PosteriorSamples(values)
+            zs = samples.sample(3)
+            samples.sample(1000)
+            graph_def = tf.get_default_graph().as_graph_def()
+            n_nodes = len(graph_def.node)
+            # The samples are not embedded in the graph definition.
+            self.assertTrue(graph_def.ByteSize() < values.nbytes // 10)
+            for _ in range(3):
+                self.assertTrue(samples.sample(3) is zs)
+                samples.sample(1000)
+
+            self.assertEqual(
+                len(tf.get_default_graph().as_graph_def().node), n_nodes)
+            self.assertAllEqual(zs.eval(), values[:3])
+
+    def test_save_load(self):
+        path = tempfile.mkdtemp()
+        try:
+            with self.test_session():
+                samples = PosteriorSamples.draw(self._variational(), 5,
+                                                path=path)
+                loaded = PosteriorSamples.load(path)
+                self.assertTrue(isinstance(loaded.samples[0], np.memmap))
+                self.assertAllEqual(loaded.values()[0], samples.values()[0])
+                self.assertAllEqual(loaded.values()[1], samples.values()[1])
+
+            samples = PosteriorSamples([np.ones((3, 1)), np.zeros((3, 2))])
+            samples.save(path)
+            loaded = PosteriorSamples.load(path, mmap=False)
+            self.assertAllEqual(loaded.values()[1], np.zeros((3, 2)))
+        finally:
+            shutil.rmtree(path)
+
+    def test_evaluate(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+            samples = PosteriorSamples.draw(variational, 8)
+            data = {'x': np.zeros(10, dtype=np.float32)}
+            y_true = np.zeros(10, dtype=np.float32)
+            # Repeated and streamed evaluations share the same samples.
+            mse = ed.evaluate('mse', MeanModel(), samples, data, y_true,
+                              n_samples=8)
+            self.assertAllClose(mse, ed.evaluate('mse', MeanModel(), samples,
+                                                 data, y_true, n_samples=8))
+            self.assertAllClose(mse, ed.evaluate('mse', MeanModel(), samples,
+                                                 data, y_true, n_samples=8,
+                                                 n_minibatch=3,
+                                                 n_samples_batch=4))
@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.models import PythonModel
+from scipy.stats import beta, bernoulli
+
+
+class BetaBernoulli(PythonModel):
+    """p(x, z) = Bernoulli(x | z) * Beta(z | 1, 1)"""
+    def _py_log_prob(self, xs, zs):
+        lp = np.zeros(zs.shape[0], dtype=np.float32)
+        for b in range(zs.shape[0]):
+            lp[b] = beta.logpdf(zs[b, :], a=1.0, b=1.0)
+            lp[b] += np.sum(bernoulli.logpmf(xs['x'], p=zs[b, :]))
+
+        return lp
+
+
+class BetaBernoulliGrad(BetaBernoulli):
+    def _py_grad_log_prob(self, xs, zs):
+        x = xs['x']
+        return np.sum(x / zs - (1.0 - x) / (1.0 - zs), 1, keepdims=True)
+
+
+def _test(model, xs, zs):
+    x = xs['x']
+    val_true = np.sum(x / zs - (1.0 - x) / (1.0 - zs), 1, keepdims=True)
+    zs_tf = tf.constant(zs, dtype=tf.float32)
+    val_ed = tf.gradients(tf.reduce_sum(model.log_prob(xs, zs_tf)), zs_tf)[0]
+    assert np.allclose(val_ed.eval(), val_true, rtol=1e-2)
+
+class test_pythonmodel_grad_log_prob_class(tf.test.TestCase):
+
+    def test_grad(self):
+        with self.test_session():
+            model = BetaBernoulliGrad()
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+
+    def test_numerical_grad(self):
+        with self.test_session():
+            model = BetaBernoulli(numerical_grad=True)
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+
+    def test_grad_two_ops_different_data(self):
+        with self.test_session():
+            model = BetaBernoulliGrad()
+            x1 = np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])
+            x2 = np.array([1, 1, 1, 0])
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            zs_tf = tf.constant(zs, dtype=tf.float32)
+            grads = [tf.gradients(tf.reduce_sum(model.log_prob({'x': x}, zs_tf)),
+                                  zs_tf)[0] for x in [x1, x2]]
+            vals = tf.get_default_session().run(grads)
+            for x, val in zip([x1, x2], vals):
+                val_true = np.sum(x / zs - (1.0 - x) / (1.0 - zs), 1,
+                                  keepdims=True)
+                assert np.allclose(val, val_true, rtol=1e-2)
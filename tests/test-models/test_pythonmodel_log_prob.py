@@ -27,11 +27,15 @@ class BetaBernoulli(PythonModel):
 def _test(model, xs, zs):
     n_samples = zs.shape[0]
     val_true = np.zeros(n_samples, dtype=np.float32)
+    x_true = xs['x']
+    if isinstance(x_true, tf.Tensor):
+        x_true = x_true.eval()
+
     for s in range(n_samples):
         p = np.squeeze(zs[s, :])
         val_true[s] = beta.logpdf(p, 1, 1)
         val_true[s] += np.sum([bernoulli.logpmf(x, p)
-                               for x in xs['x']])
+                               for x in x_true])
 
     val_ed = model.log_prob(xs, zs)
     assert np.allclose(val_ed.eval(), val_true)
@@ -49,3 +53,57 @@ class test_pythonmodel_log_prob_class(tf.test.TestCase):
             _test(model, data, zs)
             zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
             _test(model, data, zs)
+
+    def test_1latent_tensor(self):
+        with self.test_session():
+            model = BetaBernoulli()
+            data = {'x': tf.constant([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+
+    def test_1latent_thread(self):
+        with self.test_session():
+            model = BetaBernoulli(n_jobs=2, backend='thread')
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.5]])
+            _test(model, data, zs)
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+
+    def test_1latent_process(self):
+        with self.test_session():
+            model = BetaBernoulli(n_jobs=2, backend='process')
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+
+    def test_two_ops_different_data(self):
+        with self.test_session():
+            model = BetaBernoulli()
+            data1 = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            data2 = {'x': np.array([1, 1, 1, 0])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            lp1 = model.log_prob(data1, zs)
+            lp2 = model.log_prob(data2, zs)
+            val1, val2 = tf.get_default_session().run([lp1, lp2])
+            _test(model, data1, zs)
+            _test(model, data2, zs)
+            self.assertFalse(np.allclose(val1, val2))
+
+    def test_pool_close(self):
+        with self.test_session():
+            model = BetaBernoulli(n_jobs=2, backend='thread')
+            data = {'x': np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 1])}
+            zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+            _test(model, data, zs)
+            pool = model._pool
+            self.assertEqual(model._pool_size, 2)
+            # The pool is kept across data.
+            _test(model, {'x': np.array([1, 1, 0])}, zs)
+            self.assertIs(model._pool, pool)
+            model.n_jobs = 3
+            _test(model, data, zs)
+            self.assertIsNot(model._pool, pool)
+            self.assertEqual(model._pool_size, 3)
+            model.close()
+            self.assertIsNone(model._pool)
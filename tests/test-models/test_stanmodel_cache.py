@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import os
+import shutil
+import tempfile
+import tensorflow as tf
+
+model_code = """
+    data {
+      int<lower=0> N;
+      int<lower=0,upper=1> x[N];
+    }
+    parameters {
+      real<lower=0,upper=1> p;
+    }
+    model {
+      p ~ beta(1.0, 1.0);
+      for (n in 1:N)
+        x[n] ~ bernoulli(p);
+    }
+"""
+
+class test_stanmodel_cache_class(tf.test.TestCase):
+
+    def test_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with self.test_session():
+                model = ed.StanModel(model_code=model_code,
+                                     cache_dir=cache_dir)
+                pickles = [f for f in os.listdir(cache_dir)
+                           if f.endswith('.pkl')]
+                assert len(pickles) == 1
+
+                # The second model is loaded from the cache.
+                model_cached = ed.StanModel(model_code=model_code,
+                                            cache_dir=cache_dir)
+                assert len([f for f in os.listdir(cache_dir)
+                            if f.endswith('.pkl')]) == 1
+
+                data = {'N': 10, 'x': [0, 1, 0, 1, 0, 1, 0, 1, 1, 1]}
+                zs = np.array([[0.4], [0.2], [0.2351], [0.6213]])
+                val = model.log_prob(data, zs).eval()
+                val_cached = model_cached.log_prob(data, zs).eval()
+                assert np.allclose(val, val_cached)
+        finally:
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,48 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import shutil
+import tempfile
+import tensorflow as tf
+
+from edward.models import Variational, Normal, Dirichlet, PointMass
+
+
+class test_variational_save_class(tf.test.TestCase):
+
+    def test_save_load(self):
+        path = tempfile.mkdtemp()
+        try:
+            with self.test_session() as sess:
+                variational = Variational()
+                variational.add(Normal(2))
+                variational.add(Dirichlet([2, 3]))
+                variational.add(PointMass(1, params=tf.constant([1.5])))
+                tf.initialize_all_variables().run()
+                variational.save(path)
+                values = sess.run([variational.layers[0].loc,
+                                   variational.layers[0].scale,
+                                   variational.layers[1].alpha])
+
+            with self.test_session():
+                n_nodes = len(tf.get_default_graph().as_graph_def().node)
+                loaded = Variational.load(path)
+                self.assertEqual(len(loaded.layers), 3)
+                self.assertTrue(isinstance(loaded.layers[1], Dirichlet))
+                self.assertEqual(loaded.layers[1].shape, (2, 3))
+                self.assertEqual(loaded.n_params, variational.n_params)
+                self.assertAllClose(loaded.layers[0].loc.eval(), values[0])
+                self.assertAllClose(loaded.layers[0].scale.eval(), values[1])
+                self.assertAllClose(loaded.layers[1].alpha.eval(), values[2])
+                self.assertAllClose(loaded.layers[2].params.eval(), [1.5])
+                # The parameters are not embedded in the graph, and
+                # initializing all variables keeps them as loaded.
+                nodes = tf.get_default_graph().as_graph_def().node[n_nodes:]
+                self.assertFalse(any(node.op == 'Const' for node in nodes))
+                self.assertEqual(loaded.sample(4)[0].eval().shape, (4, 2))
+                tf.initialize_all_variables().run()
+                self.assertAllClose(loaded.layers[0].loc.eval(), values[0])
+        finally:
+            shutil.rmtree(path)
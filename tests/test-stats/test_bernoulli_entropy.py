@@ -24,3 +24,8 @@ class test_bernoulli_entropy_class(tf.test.TestCase):
         with self.test_session():
             self._test([0.1, 0.9, 0.1])
             self._test([0.5, 0.75, 0.2])
+
+    def test_boundary(self):
+        with self.test_session():
+            self.assertAllClose(bernoulli.entropy([0.0, 1.0]).eval(),
+                                [0.0, 0.0])
@@ -0,0 +1,26 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import binom
+from scipy import stats
+
+class test_binom_entropy_class(tf.test.TestCase):
+
+    def _test(self, n, p):
+        val_true = stats.binom.entropy(n, p)
+        with self.test_session():
+            self.assertAllClose(binom.entropy(n, p).eval(), val_true,
+                                rtol=1e-5)
+            self.assertAllClose(binom.entropy(tf.constant(n, dtype=tf.float32), tf.constant(p, dtype=tf.float32)).eval(), val_true,
+                                rtol=1e-5)
+
+    def test_0d(self):
+        self._test(1, 0.5)
+        self._test(10, 0.3)
+
+    def test_1d(self):
+        self._test(np.array([1.0, 5.0, 20.0]), np.array([0.5, 0.9, 0.2]))
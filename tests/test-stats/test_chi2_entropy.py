@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import chi2
+from scipy import stats
+
+class test_chi2_entropy_class(tf.test.TestCase):
+
+    def _test(self, df):
+        val_true = stats.chi2.entropy(df)
+        with self.test_session():
+            self.assertAllClose(chi2.entropy(df).eval(), val_true)
+            self.assertAllClose(chi2.entropy(tf.constant(df, dtype=tf.float32)).eval(), val_true)
+
+    def test_0d(self):
+        self._test(1.0)
+        self._test(3.5)
+
+    def test_1d(self):
+        self._test(np.array([0.5, 1.2, 5.3, 8.7]))
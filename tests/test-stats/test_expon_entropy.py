@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import expon
+from scipy import stats
+
+class test_expon_entropy_class(tf.test.TestCase):
+
+    def _test(self, scale):
+        val_true = stats.expon.entropy(scale)
+        with self.test_session():
+            self.assertAllClose(expon.entropy(scale).eval(), val_true)
+            self.assertAllClose(expon.entropy(tf.constant(scale, dtype=tf.float32)).eval(), val_true)
+
+    def test_0d(self):
+        self._test(1.0)
+        self._test(0.5)
+
+    def test_1d(self):
+        self._test(np.array([0.5, 1.2, 5.3, 8.7]))
@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import geom
+from scipy import stats
+
+class test_geom_entropy_class(tf.test.TestCase):
+
+    def _test(self, p):
+        val_true = stats.geom.entropy(p)
+        with self.test_session():
+            self.assertAllClose(geom.entropy(p).eval(), val_true)
+            self.assertAllClose(geom.entropy(tf.constant(p, dtype=tf.float32)).eval(), val_true)
+
+    def test_0d(self):
+        self._test(0.5)
+        self._test(0.01)
+
+    def test_1d(self):
+        self._test(np.array([0.1, 0.3, 0.7, 0.99]))
@@ -31,3 +31,7 @@ class test_invgamma_entropy_class(tf.test.TestCase):
 
     def test_1d(self):
         self._test([0.5, 1.2, 5.3, 8.7], [0.5, 1.2, 5.3, 8.7])
+
+    def test_large_shape(self):
+        # exp(lgamma(a)) overflows in float32 for these values.
+        self._test([40.0, 100.0], [0.5, 2.0])
@@ -45,7 +45,7 @@ def multinomial_entropy(n, p):
     x = np.array([i for i in product(*(range(i+1) for i in max_range))
                          if sum(i)==n])
     logpmf = [multinomial_logpmf(x[i,:], n, p) for i in range(x.shape[0])]
-    return np.sum(np.exp(logpmf) * logpmf)
+    return -np.sum(np.exp(logpmf) * logpmf)
 
 
 def multinomial_entropy_vec(n, p):
@@ -64,8 +64,8 @@ class test_multinomial_entropy_class(tf.test.TestCase):
         with self.test_session():
             self.assertAllClose(multinomial.entropy(n, p).eval(), val_true)
             self.assertAllClose(multinomial.entropy(n, tf.constant(p, dtype=tf.float32)).eval(), val_true)
-            self.assertAllClose(multinomial.entropy(n, p).eval(), val_true)
-            self.assertAllClose(multinomial.entropy(n, tf.constant(p, dtype=tf.float32)).eval(), val_true)
+            self.assertAllClose(multinomial.entropy(tf.constant(n, dtype=tf.float32), p).eval(), val_true)
+            self.assertAllClose(multinomial.entropy(tf.constant(n, dtype=tf.float32), tf.constant(p, dtype=tf.float32)).eval(), val_true)
 
 
     def test_1d(self):
@@ -77,3 +77,24 @@ class test_multinomial_entropy_class(tf.test.TestCase):
     def test_2d(self):
         self._test(np.array([1, 3]), np.array([[0.5, 0.5],[0.75, 0.25]]))
         self._test(np.array([5, 2]), np.array([[0.5, 0.5],[0.75, 0.25]]))
+
+    def test_many_categories(self):
+        p = np.arange(1.0, 21.0)
+        p = p / np.sum(p)
+        with self.test_session():
+            self.assertAllClose(multinomial.entropy(1, p).eval(),
+                                -np.sum(p * np.log(p)))
+            self.assertAllClose(
+                multinomial.entropy(tf.constant(1.0), p).eval(),
+                -np.sum(p * np.log(p)))
+
+    def test_degenerate(self):
+        with self.test_session():
+            self.assertAllClose(
+                multinomial.entropy(3, np.array([0.0, 1.0, 0.0])).eval(), 0.0)
+            # With a zero probability, the counts of the other two
+            # buckets are Binomial(2, 0.5).
+            val_true = -2.0 * 0.25 * np.log(0.25) - 0.5 * np.log(0.5)
+            self.assertAllClose(
+                multinomial.entropy(2, np.array([0.0, 0.5, 0.5])).eval(),
+                val_true)
@@ -0,0 +1,36 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import nbinom
+from scipy import stats
+
+class test_nbinom_entropy_class(tf.test.TestCase):
+
+    def _test(self, n, p):
+        val_true = stats.nbinom.entropy(n, p)
+        with self.test_session():
+            self.assertAllClose(nbinom.entropy(n, p).eval(), val_true,
+                                rtol=1e-5)
+            self.assertAllClose(nbinom.entropy(tf.constant(n, dtype=tf.float32), tf.constant(p, dtype=tf.float32)).eval(), val_true,
+                                rtol=1e-5)
+
+    def test_0d(self):
+        self._test(5.0, 0.5)
+        self._test(0.5, 0.9)
+
+    def test_1d(self):
+        self._test(np.array([1.0, 5.0, 20.0]), np.array([0.3, 0.5, 0.2]))
+
+    def test_small_p(self):
+        # scipy's entropy does not converge here; sum the pmf directly.
+        n, p = 10.0, 1e-4
+        x = np.arange(0, 2000000)
+        logpmf = stats.nbinom.logpmf(x, n, p)
+        val_true = -np.sum(np.exp(logpmf) * logpmf)
+        with self.test_session():
+            self.assertAllClose(nbinom.entropy(n, p).eval(), val_true,
+                                rtol=1e-5)
@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import poisson
+from scipy import stats
+
+class test_poisson_entropy_class(tf.test.TestCase):
+
+    def _test(self, mu):
+        val_true = stats.poisson.entropy(mu)
+        with self.test_session():
+            self.assertAllClose(poisson.entropy(mu).eval(), val_true,
+                                rtol=1e-5)
+            self.assertAllClose(poisson.entropy(tf.constant(mu, dtype=tf.float32)).eval(), val_true,
+                                rtol=1e-5)
+
+    def test_0d(self):
+        self._test(0.5)
+        self._test(3.0)
+
+    def test_1d(self):
+        # Values on both sides of the switch to the asymptotic formula.
+        self._test(np.array([0.01, 15.0, 29.9, 30.1, 50.0, 500.0]))
@@ -0,0 +1,26 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import t
+from scipy import stats
+
+class test_t_entropy_class(tf.test.TestCase):
+
+    def _test(self, df, loc, scale):
+        val_true = stats.t.entropy(df, loc, scale)
+        with self.test_session():
+            self.assertAllClose(t.entropy(df, loc, scale).eval(), val_true)
+            self.assertAllClose(t.entropy(tf.constant(df, dtype=tf.float32), tf.constant(loc, dtype=tf.float32), tf.constant(scale, dtype=tf.float32)).eval(), val_true)
+
+    def test_0d(self):
+        self._test(3.0, 0.0, 1.0)
+        self._test(0.5, 1.0, 2.0)
+
+    def test_1d(self):
+        self._test(np.array([0.5, 1.2, 5.3, 8.7]),
+                   np.array([0.0, 1.0, -2.0, 3.0]),
+                   np.array([0.5, 1.2, 5.3, 8.7]))
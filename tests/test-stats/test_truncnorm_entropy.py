@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import truncnorm
+from scipy import stats
+
+class test_truncnorm_entropy_class(tf.test.TestCase):
+
+    def _test(self, a, b, loc, scale):
+        val_true = stats.truncnorm.entropy(a, b, loc, scale)
+        with self.test_session():
+            self.assertAllClose(truncnorm.entropy(a, b, loc, scale).eval(), val_true)
+            self.assertAllClose(truncnorm.entropy(tf.constant(a, dtype=tf.float32), tf.constant(b, dtype=tf.float32), tf.constant(loc, dtype=tf.float32), tf.constant(scale, dtype=tf.float32)).eval(), val_true)
+
+    def test_0d(self):
+        self._test(-1.0, 3.0, 0.0, 1.0)
+        self._test(-0.5, 1.0, 1.5, 2.0)
+
+    def test_1d(self):
+        self._test(np.array([-1.0, 0.5, 7.0]),
+                   np.array([3.0, 2.0, 7.5]),
+                   np.array([0.0, 1.0, -2.0]),
+                   np.array([1.0, 0.5, 2.0]))
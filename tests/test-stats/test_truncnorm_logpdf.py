@@ -29,3 +29,24 @@ class test_trucnorm_logpdf_class(tf.test.TestCase):
     def test_2d(self):
         self._test(np.array([[0.0, 1.0, 0.58, 2.3],[0.0, 1.0, 0.58, 2.3]]),
                      a=-1.0, b=3.0)
+
+    def test_loc_scale(self):
+        self._test(np.array([1.2, 1.5, 2.0, 3.9], dtype=np.float32),
+                   a=-0.5, b=1.0, loc=1.5, scale=2.0)
+
+    def test_tails(self):
+        self._test(np.array([4.5, 5.0, 6.0], dtype=np.float32),
+                   a=4.0, b=np.inf)
+        self._test(np.array([-12.0, -11.5, -11.0], dtype=np.float32),
+                   a=-np.inf, b=-10.5)
+        self._test(np.array([7.1, 7.2, 7.3], dtype=np.float32),
+                   a=7.0, b=7.5)
+
+    def test_gradient(self):
+        with self.test_session():
+            loc = tf.constant(0.5)
+            val = truncnorm.logpdf(tf.constant([0.0, 1.0]), -1.0, 3.0, loc, 1.0)
+            grad = tf.gradients(val, loc)[0]
+            # d/dloc of the log density at x is (x - loc), since the
+            # normalizer is fixed in standardized units.
+            self.assertAllClose(grad.eval(), 0.0)
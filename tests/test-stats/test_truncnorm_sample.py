@@ -0,0 +1,31 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from edward.stats import truncnorm
+from scipy import stats
+
+class test_truncnorm_sample_class(tf.test.TestCase):
+
+    def _test(self, a, b, loc=0.0, scale=1.0, size=10000):
+        val_true = stats.truncnorm.mean(a, b, loc, scale)
+        with self.test_session():
+            x = truncnorm.sample(a, b, loc, scale, size=size).eval()
+            self.assertEqual(x.shape, (size, ) + np.asarray(a).shape)
+            self.assertTrue(np.all(x >= np.asarray(a)*scale + loc))
+            self.assertTrue(np.all(x <= np.asarray(b)*scale + loc))
+            self.assertAllClose(x.mean(0), val_true, atol=0.05)
+
+    def test_0d(self):
+        self._test(-1.0, 3.0)
+        self._test(-0.5, 1.0, loc=1.5, scale=2.0)
+
+    def test_1d(self):
+        self._test(np.array([-1.0, 0.5]), np.array([1.0, 2.0]))
+
+    def test_tails(self):
+        self._test(6.0, np.inf)
+        self._test(-np.inf, -8.0)
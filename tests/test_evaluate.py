@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.models import Variational, Normal, PointMass
+from edward.stats import norm
+from edward.util import log_mean_exp
+
+
+class MeanModel:
+    """
+    Predicts the mean of the latent variable for every data point.
+    """
+    def predict(self, xs, zs):
+        return tf.reduce_mean(zs) + tf.zeros_like(xs['x'])
+
+
+class LinearModel:
+    """
+    Predicts x times the mean of the latent variable.
+    """
+    def predict(self, xs, zs):
+        return xs['x'] * tf.reduce_mean(zs)
+
+
+class NormalModel:
+    """
+    Predicts the log-likelihood of each data point under
+    p(x | z) = Normal(x; z, 1), averaged over the samples of z.
+    """
+    def predict(self, xs, zs):
+        return log_mean_exp(norm.logpdf(xs['x'], zs, 1.0), 0)
+
+
+class test_evaluate_class(tf.test.TestCase):
+
+    def test_shared_samples(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+            data = {'x': np.zeros(10, dtype=np.float32)}
+            y_true = np.zeros(10, dtype=np.float32)
+            mse, mae = ed.evaluate(['mse', 'mae'], MeanModel(), variational,
+                                   data, y_true, n_samples=2)
+            # Both metrics are computed from the same prediction c, with
+            # mse = c^2 and mae = |c|.
+            self.assertAllClose(mse, mae ** 2)
+
+    def test_accuracy_type(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+            data = {'x': np.zeros(10, dtype=np.float32)}
+            y_true = np.zeros(10, dtype=np.float32)
+            # Binary accuracy, as labels are at most 1.
+            acc = ed.evaluate('accuracy', MeanModel(), variational,
+                              data, y_true)
+            acc_tf = ed.evaluate('accuracy', MeanModel(), variational,
+                                 data, tf.constant(y_true))
+            assert 0.0 <= acc <= 1.0
+            assert 0.0 <= acc_tf <= 1.0
+
+    def test_not_implemented(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+            data = {'x': np.zeros(10, dtype=np.float32)}
+            self.assertRaises(NotImplementedError, ed.evaluate, 'foo',
+                              MeanModel(), variational, data,
+                              np.zeros(10, dtype=np.float32))
+
+    def test_streaming(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(PointMass(params=tf.constant([2.0])))
+            data = {'x': np.arange(1.0, 11.0, dtype=np.float32)}
+            y_true = np.arange(10, dtype=np.float32)
+            metrics = ['mse', 'mae', 'poisson', 'log_lik']
+            val_true = ed.evaluate(metrics, LinearModel(), variational,
+                                   data, y_true, n_samples=4)
+            val_est = ed.evaluate(metrics, LinearModel(), variational,
+                                  data, y_true, n_samples=4, n_minibatch=3,
+                                  n_samples_batch=2)
+            for est, true in zip(val_est, val_true):
+                self.assertAllClose(est, true)
+
+            self.assertRaises(ValueError, ed.evaluate, metrics,
+                              LinearModel(), variational, data, y_true,
+                              n_samples=4, n_samples_batch=3)
+
+    def test_streaming_log_lik(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.zeros(1), scale=tf.ones(1)))
+            samples = ed.PosteriorSamples.draw(variational, 4)
+            values = samples.values()
+            self.assertFalse(np.allclose(values[0], values[1]))
+            data = {'x': np.arange(10, dtype=np.float32)}
+            val_true = ed.evaluate('log_lik', NormalModel(), samples, data,
+                                   n_samples=4)
+            val_est = ed.evaluate('log_lik', NormalModel(), samples, data,
+                                  n_samples=4, n_minibatch=3,
+                                  n_samples_batch=2)
+            self.assertAllClose(val_est, val_true)
@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import shutil
+import tempfile
+import tensorflow as tf
+
+from edward.models import Variational, Normal
+from edward.stats import norm
+
+
+class NormalModel:
+    """
+    p(x, z) = Normal(x; z, 1) Normal(z; 0, 1)
+    """
+    def log_prob(self, xs, zs):
+        log_prior = norm.logpdf(zs, 0.0, 1.0)
+        log_lik = tf.pack([tf.reduce_sum(norm.logpdf(xs['x'], z, 1.0))
+                           for z in tf.unpack(zs)])
+        return log_lik + log_prior
+
+class test_inference_checkpoint_class(tf.test.TestCase):
+
+    def test_resume(self):
+        path = tempfile.mkdtemp()
+        try:
+            with self.test_session():
+                variational = Variational()
+                variational.add(Normal())
+                data = {'x': np.array([0.0, 1.0, 2.0, 3.0])}
+                inference = ed.MFVI(NormalModel(), variational, data)
+                inference.run(n_iter=9, n_print=None, checkpoint_dir=path,
+                              n_checkpoint=5)
+                self.assertTrue(
+                    tf.train.latest_checkpoint(path).endswith('-10'))
+                loc = variational.layers[0].loc.eval()
+
+                # Resume a completed run; nothing more is run.
+                inference.run(n_iter=9, n_print=None, checkpoint_dir=path,
+                              resume=True)
+                self.assertEqual(inference.t_start, 10)
+                self.assertAllClose(variational.layers[0].loc.eval(), loc)
+
+                # Resume and continue the run.
+                inference.run(n_iter=14, n_print=None, checkpoint_dir=path,
+                              n_checkpoint=5, resume=True)
+                self.assertEqual(inference.global_step.eval(), 15)
+                self.assertTrue(
+                    tf.train.latest_checkpoint(path).endswith('-15'))
+
+                # Without resuming, the run starts over.
+                inference.initialize(n_print=None, checkpoint_dir=path)
+                self.assertEqual(inference.t_start, 0)
+                inference.finalize()
+        finally:
+            shutil.rmtree(path)
+
+if __name__ == '__main__':
+    tf.test.main()
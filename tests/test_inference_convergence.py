@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+
+class QuadraticModel:
+    """
+    log p(x, z) = -(z - 1)^2 - 10
+    """
+    n_vars = 1
+
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(zs - 1.0), 1) - 10.0
+
+class test_inference_convergence_class(tf.test.TestCase):
+
+    def test_tol(self):
+        with self.test_session():
+            inference = ed.MAP(QuadraticModel())
+            inference.run(n_iter=10000, n_print=None, tol=1e-4, patience=5)
+            n_iter = inference.global_step.eval()
+            self.assertTrue(n_iter < 10000)
+            self.assertTrue(inference.n_converged >= 5)
+
+    def test_tol_params(self):
+        with self.test_session():
+            inference = ed.MAP(QuadraticModel())
+            inference.run(n_iter=10000, n_print=None, tol_params=1e-4)
+            self.assertTrue(inference.global_step.eval() < 10000)
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [1.0], atol=1e-2)
+
+    def test_no_convergence(self):
+        with self.test_session():
+            inference = ed.MAP(QuadraticModel())
+            inference.run(n_iter=20, n_print=None, tol=1e-12)
+            self.assertEqual(inference.global_step.eval(), 21)
+
+if __name__ == '__main__':
+    tf.test.main()
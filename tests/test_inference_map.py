@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+
+class QuadraticModel:
+    """
+    log p(x, z) = -(z - 1)^2
+    """
+    n_vars = 1
+
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(zs - 1.0), 1)
+
+class TwoLayerModel:
+    """
+    log p(x, z1, z2) = -(z1 - 1)^2 - ||z2 + 2||^2
+    """
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(zs[0] - 1.0), 1) - \
+            tf.reduce_sum(tf.square(zs[1] + 2.0), [1, 2])
+
+class DictModel:
+    """
+    log p(x, z) = -(z['a'] - 1)^2 - (z['b'] + 2)^2
+    """
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(zs['a'] - 1.0), 1) - \
+            tf.reduce_sum(tf.square(zs['b'] + 2.0), 1)
+
+class NoLatentModel:
+    """
+    log p(x) = -(w - x)^2, with a parameter w and no latent variables.
+    """
+    def __init__(self):
+        self.w = tf.Variable(0.0)
+
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(self.w - xs['x'])) + \
+            tf.zeros([ed.get_dims(zs)[0]])
+
+class test_inference_map_class(tf.test.TestCase):
+
+    def test_vector(self):
+        with self.test_session():
+            inference = ed.MAP(QuadraticModel())
+            self.assertEqual(ed.get_dims(inference.params), [1])
+            inference.run(n_iter=200, n_print=None, method='lbfgs')
+            self.assertAllClose(inference.params.eval(), [1.0], atol=1e-3)
+            self.assertEqual(inference.variational.layers[0].shape, (1, ))
+
+    def test_list(self):
+        with self.test_session():
+            params = [tf.Variable(tf.zeros([1])), tf.Variable(tf.zeros([2, 3]))]
+            inference = ed.MAP(TwoLayerModel(), params=params)
+            self.assertEqual(len(inference.variational.layers), 2)
+            inference.run(n_iter=200, n_print=None, method='lbfgs')
+            self.assertAllClose(params[0].eval(), [1.0], atol=1e-3)
+            self.assertAllClose(params[1].eval(), -2.0 * np.ones([2, 3]),
+                                atol=1e-3)
+
+    def test_dict(self):
+        with self.test_session():
+            params = {'a': tf.Variable(tf.zeros([1])),
+                      'b': tf.Variable(tf.zeros([2]))}
+            inference = ed.MAP(DictModel(), params=params)
+            self.assertEqual(len(inference.variational.layers), 2)
+            inference.run(n_iter=200, n_print=None, method='lbfgs')
+            self.assertAllClose(params['a'].eval(), [1.0], atol=1e-3)
+            self.assertAllClose(params['b'].eval(), [-2.0, -2.0], atol=1e-3)
+
+    def test_no_n_vars(self):
+        with self.test_session():
+            model = QuadraticModel()
+            model.n_vars = None
+            inference = ed.MAP(model)
+            self.assertEqual(ed.get_dims(inference._latent_variables()),
+                             [1, 0])
+            self.assertEqual(tf.trainable_variables(), [])
+
+    def test_no_latent_variables(self):
+        with self.test_session():
+            model = NoLatentModel()
+            data = {'x': np.array([3.0], dtype=np.float32)}
+            inference = ed.MAP(model, data)
+            inference.run(n_iter=200, n_print=None, method='lbfgs')
+            self.assertAllClose(model.w.eval(), 3.0, atol=1e-3)
+
+if __name__ == '__main__':
+    tf.test.main()
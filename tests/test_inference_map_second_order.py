@@ -0,0 +1,55 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+
+class QuadraticModel:
+    """
+    log p(x, z) = -sum_i c_i (z_i - x_i)^2
+    """
+    n_vars = 2
+
+    def log_prob(self, xs, zs):
+        c = tf.constant([1.0, 100.0])
+        return -tf.reduce_sum(c * tf.square(zs - xs['x']), 1)
+
+class test_inference_map_second_order_class(tf.test.TestCase):
+
+    def _test(self, method):
+        with self.test_session():
+            data = {'x': np.array([1.0, -2.0], dtype=np.float32)}
+            inference = ed.MAP(QuadraticModel(), data)
+            inference.run(n_iter=100, n_print=None, method=method)
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [1.0, -2.0], atol=1e-3)
+            # Converges in far fewer than n_iter iterations.
+            self.assertTrue(inference.global_step.eval() < 20)
+
+    def test_lbfgs(self):
+        self._test('lbfgs')
+
+    def test_newton(self):
+        self._test('newton')
+
+    def test_minibatch(self):
+        with self.test_session():
+            data = {'x': np.array([1.0, -2.0], dtype=np.float32)}
+            inference = ed.MAP(QuadraticModel(), data)
+            self.assertRaises(ValueError, inference.initialize,
+                              method='lbfgs', n_minibatch=1)
+    def test_positional_n_iter(self):
+        with self.test_session():
+            data = {'x': np.array([1.0, -2.0], dtype=np.float32)}
+            inference = ed.MAP(QuadraticModel(), data)
+            inference.run(50, n_print=None, method='lbfgs')
+            self.assertEqual(inference.n_iter, 50)
+            self.assertEqual(inference.method, 'lbfgs')
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [1.0, -2.0], atol=1e-3)
+
+if __name__ == '__main__':
+    tf.test.main()
@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+
+class QuadraticModel:
+    """
+    log p(x, z) = -(z - 1)^2
+    """
+    n_vars = 1
+
+    def log_prob(self, xs, zs):
+        return -tf.reduce_sum(tf.square(zs - 1.0), 1)
+
+class test_inference_optimizer_class(tf.test.TestCase):
+
+    def _map(self):
+        return ed.MAP(QuadraticModel(), params=tf.Variable([0.0]))
+
+    def test_name(self):
+        with self.test_session():
+            inference = self._map()
+            inference.initialize(n_print=None, optimizer='sgd',
+                                 learning_rate=0.25)
+            inference.update()
+            # Gradient of -(z - 1)^2 at z = 0 is 2.
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [0.5])
+            inference.finalize()
+
+    def test_schedule(self):
+        with self.test_session():
+            inference = self._map()
+            inference.initialize(
+                n_print=None, optimizer='sgd',
+                learning_rate=lambda step: 0.25 / tf.to_float(step + 1))
+            inference.update()
+            inference.update()
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [0.5 + 0.125 * 1.0])
+            inference.finalize()
+
+    def test_multipliers(self):
+        with self.test_session():
+            inference = self._map()
+            params = inference.variational.layers[0].params
+            inference.initialize(n_print=None, optimizer='sgd',
+                                 learning_rate=0.25,
+                                 lr_multipliers={params: 0.5})
+            inference.update()
+            self.assertAllClose(params.eval(), [0.25])
+            inference.finalize()
+
+    def test_instance_clip(self):
+        with self.test_session():
+            inference = self._map()
+            optimizer = tf.train.GradientDescentOptimizer(1.0)
+            inference.initialize(n_print=None, optimizer=optimizer,
+                                 clip_norm=0.1)
+            inference.update()
+            params = inference.variational.layers[0].params.eval()
+            self.assertAllClose(params, [0.1])
+            self.assertEqual(inference.global_step.eval(), 1)
+            inference.finalize()
+
+    def test_unknown(self):
+        with self.test_session():
+            inference = self._map()
+            self.assertRaises(ValueError, inference.initialize,
+                              optimizer='newton')
+
+if __name__ == '__main__':
+    tf.test.main()
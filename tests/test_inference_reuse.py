@@ -0,0 +1,70 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.models import Variational, Normal
+from edward.stats import norm
+
+
+class NormalModel:
+    """
+    p(x, z) = Normal(x; z, 1) Normal(z; 0, 1)
+    """
+    def log_prob(self, xs, zs):
+        log_prior = norm.logpdf(zs, 0.0, 1.0)
+        log_lik = tf.pack([tf.reduce_sum(norm.logpdf(xs['x'], z, 1.0))
+                           for z in tf.unpack(zs)])
+        return log_lik + log_prior
+
+class test_inference_reuse_class(tf.test.TestCase):
+
+    def test_reuse(self):
+        with self.test_session() as sess:
+            # A variable not belonging to the inference.
+            other = tf.Variable(0.0)
+            sess.run(other.initializer)
+            sess.run(other.assign(5.0))
+
+            variational = Variational()
+            variational.add(Normal())
+            data = {'x': np.array([0.0, 1.0, 2.0, 3.0])}
+            inference = ed.MFVI(NormalModel(), variational, data)
+            inference.initialize(n_print=None)
+            for t in range(10):
+                inference.update()
+
+            inference.finalize()
+            n_nodes = len(tf.get_default_graph().as_graph_def().node)
+            loc = variational.layers[0].loc.eval()
+
+            # Warm start with new data of the same shape.
+            inference.assign_data({'x': np.array([4.0, 5.0, 6.0, 7.0])})
+            inference.initialize(n_print=None, warm_start=True)
+            assert np.allclose(variational.layers[0].loc.eval(), loc)
+            for t in range(10):
+                inference.update()
+
+            inference.finalize()
+            assert len(tf.get_default_graph().as_graph_def().node) == n_nodes
+            assert np.allclose(other.eval(), 5.0)
+
+    def test_reuse_minibatch(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal())
+            data = {'x': np.arange(10, dtype=np.float32)}
+            inference = ed.MFVI(NormalModel(), variational, data)
+            inference.run(n_iter=5, n_minibatch=2, n_print=None)
+            n_nodes = len(tf.get_default_graph().as_graph_def().node)
+
+            # The graph and its input queues are reused.
+            inference.run(n_iter=5, n_minibatch=2, n_print=None)
+            assert len(tf.get_default_graph().as_graph_def().node) == n_nodes
+            assert np.isfinite(inference.update())
+
+if __name__ == '__main__':
+    tf.test.main()
@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import csv
+import edward as ed
+import json
+import numpy as np
+import os
+import shutil
+import tempfile
+import tensorflow as tf
+
+from edward.models import Variational, Normal
+from edward.monitoring import CSVSink, JSONLinesSink, MemorySink, \
+    TensorBoardSink
+from edward.stats import norm
+
+
+class NormalModel:
+    """
+    p(x, z) = Normal(x; z, 1) Normal(z; 0, 1)
+    """
+    def log_prob(self, xs, zs):
+        log_prior = norm.logpdf(zs, 0.0, 1.0)
+        log_lik = tf.pack([tf.reduce_sum(norm.logpdf(xs['x'], z, 1.0))
+                           for z in tf.unpack(zs)])
+        return log_lik + log_prior
+
+class test_monitoring_class(tf.test.TestCase):
+
+    def test_memory(self):
+        sink = MemorySink(maxlen=2)
+        for t in range(3):
+            sink.write({'step': t, 'loss': 1.0})
+
+        self.assertEqual([record['step'] for record in sink.records], [1, 2])
+
+    def test_files(self):
+        path = tempfile.mkdtemp()
+        try:
+            csv_sink = CSVSink(os.path.join(path, 'records.csv'))
+            json_sink = JSONLinesSink(os.path.join(path, 'records.jsonl'))
+            tb_sink = TensorBoardSink(os.path.join(path, 'logs'))
+            for sink in [csv_sink, json_sink, tb_sink]:
+                sink.write({'step': 0, 'loss': 2.0})
+                sink.write({'step': 1, 'loss': 1.5})
+                sink.close()
+
+            with open(os.path.join(path, 'records.csv')) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(float(rows[1]['loss']), 1.5)
+            with open(os.path.join(path, 'records.jsonl')) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(records[0], {'step': 0, 'loss': 2.0})
+            self.assertTrue(len(os.listdir(os.path.join(path, 'logs'))) > 0)
+        finally:
+            shutil.rmtree(path)
+
+    def test_write_error(self):
+        path = tempfile.mkdtemp()
+        try:
+            sink = JSONLinesSink(os.path.join(path, 'records.jsonl'))
+            sink.write({'step': 0, 'loss': object()})
+            sink.write({'step': 1, 'loss': 1.5})
+            self.assertRaises(TypeError, sink.flush)
+            self.assertRaises(TypeError, sink.close)
+        finally:
+            shutil.rmtree(path)
+
+    def test_inference(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal())
+            data = {'x': np.array([0.0, 1.0, 2.0, 3.0])}
+            inference = ed.MFVI(NormalModel(), variational, data)
+            sink = MemorySink()
+            inference.run(n_iter=20, n_print=None, sinks=[sink], n_record=10)
+            records = list(sink.records)
+            self.assertEqual([record['step'] for record in records],
+                             [0, 10, 20])
+            record = records[-1]
+            self.assertEqual(record['examples_per_sec'],
+                             4.0 / record['step_time'])
+            self.assertEqual(record['layer0/scale/std'], 0.0)
+
+            # The summaries are of the parameters before the step.
+            inference.initialize(n_print=None, sinks=[sink], n_record=1)
+            loc = variational.layers[0].loc.eval()
+            inference.record(0, inference.update())
+            self.assertAllClose(sink.records[-1]['layer0/loc/mean'], loc)
+            inference.finalize()
+
+    def test_inference_feeding(self):
+        with self.test_session() as sess:
+            variational = Variational()
+            variational.add(Normal())
+            x = tf.placeholder(tf.float32)
+            inference = ed.MFVI(NormalModel(), variational, {'x': x})
+            inference.initialize(n_print=None, sinks=[MemorySink()])
+            # The number of data points is unknown, so the throughput
+            # is left out.
+            self.assertIsNone(inference._batch_size)
+            sess.run(inference.train, {x: np.array([0.0, 1.0, 2.0, 3.0])})
+            inference.finalize()
+
+if __name__ == '__main__':
+    tf.test.main()
@@ -0,0 +1,91 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.models import Variational, Normal
+from edward.util import get_dims
+
+
+class NormalModel:
+    """
+    p(x, z) = Normal(x; z, 1) Normal(z; 0, 1)
+    """
+    def sample_prior(self, n):
+        return tf.random_normal([n, 1])
+
+    def sample_likelihood(self, zs, n):
+        return {'x': zs + tf.random_normal([get_dims(zs)[0], n])}
+
+
+class NumpyNormalModel:
+    """
+    p(x, z) = Normal(x; z, 1) Normal(z; 0, 1), with the likelihood
+    sampled in NumPy.
+    """
+    def sample_likelihood(self, zs, n):
+        return [{'x': (z + np.random.randn(n)).astype(np.float32)}
+                for z in zs]
+
+
+def T(xs, zs):
+    return tf.reduce_mean(xs['x'], 1)
+
+
+class test_ppc_class(tf.test.TestCase):
+
+    def test_batch(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.constant([5.0]),
+                                   scale=tf.constant([0.1])))
+            data = {'x': np.array([5.0, 5.2, 4.8, 5.1], dtype=np.float32)}
+            Txreps, Txs = ed.ppc(NormalModel(), variational, data, T,
+                                 n_samples=50, batch=True)
+            assert Txreps.shape == (50, )
+            assert Txs.shape == (50, )
+            self.assertAllClose(Txs, np.zeros(50) + data['x'].mean())
+            self.assertAllClose(Txreps.mean(), 5.0, atol=0.5)
+
+            # Prior predictive check.
+            Txreps = ed.ppc(NormalModel(), data=data, T=T, n_samples=50,
+                            batch=True)[0]
+            assert Txreps.shape == (50, )
+
+    def test_batch_graph_size(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.constant([0.0]),
+                                   scale=tf.constant([1.0])))
+            data = {'x': np.zeros(4, dtype=np.float32)}
+            sizes = []
+            for n_samples in [10, 1000]:
+                n_nodes = len(tf.get_default_graph().as_graph_def().node)
+                ed.ppc(NormalModel(), variational, data, T,
+                       n_samples=n_samples, batch=True)
+                sizes += [len(tf.get_default_graph().as_graph_def().node) -
+                          n_nodes]
+
+            assert sizes[0] == sizes[1]
+
+    def test_chunks(self):
+        with self.test_session():
+            variational = Variational()
+            variational.add(Normal(loc=tf.constant([5.0]),
+                                   scale=tf.constant([0.1])))
+            data = {'x': np.array([5.0, 5.2, 4.8, 5.1], dtype=np.float32)}
+            T_scalar = lambda xs, z: tf.reduce_mean(xs['x'])
+            for n_jobs in [1, 2]:
+                Txreps, Txs = ed.ppc(NumpyNormalModel(), variational, data,
+                                     T_scalar, n_samples=10, chunk_size=3,
+                                     n_jobs=n_jobs)
+                assert Txreps.shape == (10, )
+                self.assertAllClose(Txs, np.zeros(10) + data['x'].mean())
+                self.assertAllClose(Txreps.mean(), 5.0, atol=1.0)
+
+            self.assertRaises(ValueError, ed.ppc, NumpyNormalModel(),
+                              variational, data, T_scalar, n_samples=10,
+                              n_jobs=0)
@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from edward.criticisms import _gpd_fit
+from scipy.misc import logsumexp
+from scipy.stats import genpareto
+
+
+class test_psis_loo_class(tf.test.TestCase):
+
+    def _log_lik(self):
+        np.random.seed(0)
+        x = np.random.randn(50)
+        mu = 0.15 * np.random.randn(2000) + np.mean(x)
+        return -0.5 * np.log(2 * np.pi) - 0.5 * (x - mu[:, np.newaxis])**2
+
+    def test_importance_sampling(self):
+        with self.test_session():
+            # With a well-behaved posterior, smoothing hardly changes
+            # the raw importance sampling estimate.
+            log_lik = self._log_lik()
+            elpd = -logsumexp(-log_lik, 0) + np.log(log_lik.shape[0])
+            loo, se, k = ed.psis_loo(log_lik)
+            self.assertAllClose(loo, -2.0 * np.sum(elpd), rtol=1e-3)
+            self.assertEqual(k.shape, (50, ))
+            self.assertTrue(np.all(k < 0.5))
+
+    def test_chunks(self):
+        with self.test_session():
+            log_lik = self._log_lik()
+            loo, se, k = ed.psis_loo(log_lik)
+            loo_chunk, se_chunk, k_chunk = ed.psis_loo(log_lik,
+                                                       chunk_size=16)
+            self.assertAllClose(loo_chunk, loo, rtol=1e-5)
+            self.assertAllClose(se_chunk, se, rtol=1e-5)
+            self.assertAllClose(k_chunk, k)
+
+    def test_gpd_fit(self):
+        for k_true in [0.2, 0.5, 0.9]:
+            x = genpareto.rvs(k_true, size=(5000, 2), random_state=1)
+            k, sigma = _gpd_fit(np.sort(x, 0))
+            self.assertAllClose(k, [k_true, k_true], atol=0.1)
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import json
+import numpy as np
+import tensorflow as tf
+import threading
+
+from edward.models import PosteriorSamples
+from six.moves.urllib.request import urlopen
+
+
+class LinearModel:
+    """
+    Predicts x times the mean of the latent variable.
+    """
+    def predict(self, xs, zs):
+        return xs['x'] * tf.reduce_mean(zs)
+
+
+class SumModel:
+    """
+    Predicts a single value for the whole batch.
+    """
+    def predict(self, xs, zs):
+        return tf.reduce_sum(xs['x']) * tf.reduce_mean(zs, 0)
+
+
+class test_serving_class(tf.test.TestCase):
+
+    def _predictor(self, **kwargs):
+        samples = PosteriorSamples(2.0 * np.ones((10, 1), dtype=np.float32))
+        data = {'x': np.zeros(1, dtype=np.float32)}
+        return ed.Predictor(LinearModel(), samples, data, n_samples=10,
+                            **kwargs)
+
+    def test_predict(self):
+        with self.test_session():
+            predictor = self._predictor()
+            self.assertAllClose(predictor.predict({'x': [1.0, 2.0, 3.0]}),
+                                [2.0, 4.0, 6.0])
+            self.assertRaises(KeyError, predictor.predict, {'y': [1.0]})
+            self.assertRaises(ValueError, predictor.predict, {'x': 1.0})
+            self.assertRaises(ValueError, predictor.predict,
+                              {'x': [[1.0], [2.0]]})
+
+    def test_malformed_concurrent(self):
+        with self.test_session():
+            predictor = self._predictor(max_latency=0.05)
+            predictor.start()
+            results = {}
+
+            def request(i, x):
+                try:
+                    results[i] = predictor.predict({'x': x})
+                except ValueError as e:
+                    results[i] = e
+
+            threads = [threading.Thread(target=request, args=(0, [1.0])),
+                       threading.Thread(target=request, args=(1, [[1.0]])),
+                       threading.Thread(target=request, args=(2, [3.0]))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            predictor.stop()
+            # Only the malformed request fails.
+            self.assertAllClose(results[0], [2.0])
+            self.assertTrue(isinstance(results[1], ValueError))
+            self.assertAllClose(results[2], [6.0])
+            self.assertAllClose(predictor.predict({'x': [1.0]}), [2.0])
+
+    def test_bad_shape(self):
+        with self.test_session():
+            samples = PosteriorSamples(np.ones((10, 1), dtype=np.float32))
+            data = {'x': np.zeros(1, dtype=np.float32)}
+            predictor = ed.Predictor(SumModel(), samples, data, n_samples=10,
+                                     max_latency=0.05)
+            self.assertRaises(ValueError, predictor.predict,
+                              {'x': [1.0, 2.0]})
+
+            predictor.start()
+            results = {}
+
+            def request(i, x):
+                try:
+                    results[i] = predictor.predict({'x': x})
+                except ValueError as e:
+                    results[i] = e
+
+            threads = [threading.Thread(target=request, args=(i, [1.0, 2.0]))
+                       for i in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            predictor.stop()
+            # Every request of a failed batch fails, and none hangs.
+            for i in range(3):
+                self.assertTrue(isinstance(results[i], ValueError))
+
+    def test_concurrent(self):
+        with self.test_session():
+            predictor = self._predictor(max_latency=0.05)
+            predictor.start()
+            results = {}
+
+            def request(i):
+                results[i] = predictor.predict({'x': [float(i)] * (i + 1)})
+
+            threads = [threading.Thread(target=request, args=(i, ))
+                       for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            predictor.stop()
+            for i in range(8):
+                self.assertAllClose(results[i], [2.0 * i] * (i + 1))
+
+    def test_http(self):
+        with self.test_session():
+            predictor = self._predictor()
+            server = predictor.serve(port=0)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.daemon = True
+            thread.start()
+            try:
+                url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+                body = json.dumps({'x': [1.0, 2.0]}).encode('utf-8')
+                response = json.loads(urlopen(url, body).read().decode('utf-8'))
+                self.assertAllClose(response['predictions'], [2.0, 4.0])
+            finally:
+                server.shutdown()
+                server.server_close()
+                predictor.stop()
@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import edward as ed
+import numpy as np
+import tensorflow as tf
+
+from scipy.misc import logsumexp
+
+
+def waic_np(log_lik):
+    n_samples = log_lik.shape[0]
+    lppd = logsumexp(log_lik, 0) - np.log(n_samples)
+    p_waic = np.var(log_lik, 0, ddof=1)
+    elpd = lppd - p_waic
+    return -2.0 * np.sum(elpd), 2.0 * np.sqrt(len(elpd) * np.var(elpd))
+
+
+class test_waic_class(tf.test.TestCase):
+
+    def _log_lik(self):
+        np.random.seed(0)
+        x = np.random.randn(20)
+        mu = 0.1 * np.random.randn(100)
+        return -0.5 * np.log(2 * np.pi) - 0.5 * (x - mu[:, np.newaxis])**2
+
+    def test_value(self):
+        with self.test_session():
+            log_lik = self._log_lik()
+            self.assertAllClose(ed.waic(log_lik), waic_np(log_lik),
+                                rtol=1e-4)
+
+    def test_tensor(self):
+        with self.test_session():
+            log_lik = self._log_lik()
+            self.assertAllClose(ed.waic(tf.constant(log_lik, tf.float32)),
+                                waic_np(log_lik), rtol=1e-4)
+
+    def test_chunks(self):
+        with self.test_session():
+            log_lik = self._log_lik()
+            self.assertAllClose(ed.waic(log_lik, chunk_size=7),
+                                ed.waic(log_lik), rtol=1e-5)